@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+""" Benchmark cold and warm `load()` of the RIT and MAYA catalogs
+from synthetic catalog files. No network requests are made.
+
+Cold: the catalog table is parsed from `metadata.csv` (RIT)
+      or `catalog.zip` (MAYA), and the binary cache is written.
+Warm: the catalog table is read from the binary cache.
+
+Also times constructing an `SXSCatalog` from a synthetic catalog dict,
+and the first access to the metadata of one of its simulations.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+tmp_dir = tempfile.TemporaryDirectory()
+os.environ["NR_CATALOG_CACHE"] = tmp_dir.name
+
+libpath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if libpath not in sys.path:
+    sys.path.append(libpath)
+
+import numpy as np
+import pandas as pd
+from nrcatalogtools import cache, utils
+from nrcatalogtools.maya import MayaCatalog
+from nrcatalogtools.rit import RITCatalog, RITCatalogHelper
+from nrcatalogtools.sxs import SXSCatalog
+
+num_sims = 2000
+num_fields = 60
+num_repeats = 5
+
+
+def write_fake_rit_metadata():
+    metadata_dir = utils.rit_catalog_info["metadata_dir"]
+    metadata_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(0)
+    metadata = pd.DataFrame(
+        rng.random((num_sims, num_fields)),
+        columns=[f"field-{n}" for n in range(num_fields)],
+    )
+    names = [f"RIT:BBH:{idx:04d}-n100-id0" for idx in range(1, 1 + num_sims)]
+    metadata["simulation_name"] = names
+    metadata["metadata_location"] = [
+        str(metadata_dir / f"{name}_Metadata.txt") for name in names
+    ]
+    metadata["waveform_data_link"] = [
+        f"{utils.rit_catalog_info['data_url']}/ExtrapStrain_{name}.h5" for name in names
+    ]
+    metadata["waveform_data_location"] = [
+        str(utils.rit_catalog_info["data_dir"] / f"ExtrapStrain_{name}.h5")
+        for name in names
+    ]
+    metadata.to_csv(metadata_dir / "metadata.csv")
+    return metadata_dir / "metadata.csv"
+
+
+def write_fake_maya_catalog():
+    cache_dir = utils.maya_catalog_info["cache_dir"]
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    columns = ["GTID", "GT_Tag", "q", "a1x", "a1y", "a1z", "a2x", "a2y", "a2z"]
+    columns += [f"field{n}" for n in range(num_fields - len(columns))] + ["Momega"]
+    rng = np.random.default_rng(0)
+    lines = ["| " + " | ".join(columns) + " |"]
+    lines.append("|" + "|".join(["---"] * len(columns)) + "|")
+    for idx in range(1, 1 + num_sims):
+        values = [f"GT{idx:04d}", f"D11_q{idx}_a0.0_m100"]
+        values += [f"{v:.6f}" for v in rng.random(len(columns) - 3)] + ["-"]
+        lines.append("| " + " | ".join(values) + " |")
+    temp_txt = cache_dir / "catalog.temp.txt"
+    temp_txt.write_text("\n".join(lines) + "\n")
+    with zipfile.ZipFile(
+        cache_dir / "catalog.zip", "w", compression=zipfile.ZIP_BZIP2
+    ) as catalog_zip:
+        catalog_zip.write(temp_txt, arcname="catalog.txt")
+    temp_txt.unlink()
+    return cache_dir / "catalog.zip"
+
+
+def fake_sxs_catalog():
+    records, simulations = {}, {}
+    for idx in range(1, 1 + num_sims):
+        sim_name = f"SXS:BBH:{idx:04d}"
+        records[str(idx)] = {
+            "title": sim_name,
+            "version": 1,
+            "files": [
+                {
+                    "filename": f"{sim_name}/Lev{lev}/{file_name}",
+                    "checksum": f"{sim_name}/Lev{lev}/{file_name}",
+                    "filesize": 1,
+                    "links": {"download": ""},
+                }
+                for lev in [4, 5]
+                for file_name in [
+                    "rhOverM_Asymptotic_GeometricUnits_CoM.h5",
+                    "metadata.json",
+                ]
+            ],
+        }
+        simulations[sim_name] = {"simulation_name": sim_name, "initial_mass_ratio": 1.0}
+    return {
+        "catalog_file_description": "",
+        "modified": "",
+        "records": records,
+        "simulations": simulations,
+    }
+
+
+def time_load(load, source_path, cold):
+    timings = []
+    for _ in range(num_repeats):
+        if cold:
+            for path in [
+                cache.dataframe_cache_path(source_path),
+                cache.dataframe_cache_path(source_path).with_suffix(".cache.json"),
+            ]:
+                if path.exists():
+                    path.unlink()
+        load.cache_clear()
+        start = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def read_rit_table():
+    return RITCatalogHelper().read_metadata_df_from_disk()
+
+
+def read_maya_table():
+    cache_path = utils.maya_catalog_info["cache_dir"] / "catalog.zip"
+    catalog_df = cache.read_dataframe_cache(cache_path)
+    if catalog_df is None:
+        catalog_df = MayaCatalog._read_catalog_zip(cache_path)
+        cache.write_dataframe_cache(catalog_df, cache_path)
+    return catalog_df
+
+
+if __name__ == "__main__":
+    rit_source = write_fake_rit_metadata()
+    maya_source = write_fake_maya_catalog()
+    for name, load, read_table, source_path in [
+        ("RIT", RITCatalog.load, read_rit_table, rit_source),
+        ("MAYA", MayaCatalog.load, read_maya_table, maya_source),
+    ]:
+
+        def load_catalog():
+            if name == "MAYA":
+                return load(download=False)
+            return load(num_sims_to_crawl=num_sims)
+
+        load_catalog.cache_clear = load.cache_clear
+        read_table.cache_clear = lambda: None
+        for label, func in [("load()", load_catalog), ("table read", read_table)]:
+            cold = time_load(func, source_path, cold=True)
+            warm = time_load(func, source_path, cold=False)
+            print(
+                f"{name:>5} {label:>10} of {num_sims} simulations:"
+                f" cold {1e3 * cold:8.1f} ms, warm {1e3 * warm:8.1f} ms"
+            )
+
+    sxs_catalog = fake_sxs_catalog()
+    start = time.perf_counter()
+    sxs_catalog = SXSCatalog(sxs_catalog)
+    construct = time.perf_counter() - start
+    start = time.perf_counter()
+    sxs_catalog.get_metadata("SXS:BBH:0001")
+    first_access = time.perf_counter() - start
+    print(
+        f"  SXS construction of {num_sims} simulations: {1e3 * construct:8.1f} ms,"
+        f" first metadata access {1e3 * first_access:8.1f} ms"
+    )
+    tmp_dir.cleanup()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+""" Benchmark downloading 100 files one after the other with
+`utils.download_file`, from a local HTTP server.
+
+The server adds a fixed latency to every new connection and to every
+request, to stand in for the round trips to a remote catalog website.
+The number of connections and of requests (by method) are reported.
+"""
+
+import collections
+import functools
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+libpath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if libpath not in sys.path:
+    sys.path.append(libpath)
+
+from nrcatalogtools import utils
+
+num_files = 100
+file_size = 100000
+connection_latency = 0.02
+request_latency = 0.005
+
+counts = collections.Counter()
+
+
+class LatencyHTTPRequestHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        counts["connections"] += 1
+        time.sleep(connection_latency)
+        super().setup()
+
+    def do_HEAD(self):
+        counts["HEAD"] += 1
+        time.sleep(request_latency)
+        super().do_HEAD()
+
+    def do_GET(self):
+        counts["GET"] += 1
+        time.sleep(request_latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        web_root = Path(tmp_dir) / "web"
+        web_root.mkdir()
+        for idx in range(num_files):
+            (web_root / f"GT{idx:04d}.h5").write_bytes(os.urandom(file_size))
+
+        handler = functools.partial(LatencyHTTPRequestHandler, directory=str(web_root))
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = "http://127.0.0.1:{}".format(server.server_address[1])
+
+        start = time.perf_counter()
+        for idx in range(num_files):
+            utils.download_file(
+                f"{url}/GT{idx:04d}.h5", Path(tmp_dir) / "data" / f"GT{idx:04d}.h5"
+            )
+        elapsed = time.perf_counter() - start
+        server.shutdown()
+        server.server_close()
+
+        num_downloaded = len(list((Path(tmp_dir) / "data").glob("*.h5")))
+        print(
+            f"{num_downloaded} files downloaded in {elapsed:.2f} s:"
+            f" {counts['connections']} connections,"
+            f" {counts['HEAD']} HEAD and {counts['GET']} GET requests"
+        )
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+""" Benchmark the open-to-array latency of `WaveformModes.load_from_h5`
+on synthetic waveform files in the MAYA and RIT HDF5 layouts.
+
+MAYA: all modes are sampled at the same, uniform times.
+RIT:  every mode is sampled at its own times, and the file holds other
+      groups and attributes besides the modes.
+
+Both hold the amplitude and phase of all modes up to `ell_max` in the
+groups `amp_l{ell}_m{em}` and `phase_l{ell}_m{em}`.
+
+Also times loading a file and accessing the (2, 2) mode, when loading
+all modes, only the (2, +-2) modes, or loading modes lazily, and
+repeated loads from the on-disk cache of resampled modes.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+tmp_cache_dir = tempfile.TemporaryDirectory()
+os.environ["NR_CATALOG_CACHE"] = tmp_cache_dir.name
+
+libpath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if libpath not in sys.path:
+    sys.path.append(libpath)
+
+import h5py
+import numpy as np
+from nrcatalogtools import waveform
+
+ell_max = 8
+num_times = 20000
+num_repeats = 5
+
+
+def write_mode_file(path, layout):
+    t_start, dt = -num_times * 0.5 + 100.0, 0.5
+    with h5py.File(path, "w") as h5_file:
+        if layout == "rit":
+            h5_file.attrs["name"] = "RIT:BBH:0001-n100-id0"
+            h5_file.create_group("auxiliary-info")
+            h5_file["auxiliary-info"]["Omega-vs-time"] = np.zeros(num_times)
+        time = np.arange(t_start, 100.0 + 0.5 * dt, dt)
+        for ell in range(2, ell_max + 1):
+            for em in range(-ell, ell + 1):
+                if layout == "rit":
+                    mode_dt = dt * (1 - 0.01 * (ell + em + ell_max) / ell_max)
+                    time = np.arange(t_start, 100.0 + 0.5 * mode_dt, mode_dt)
+                omega = 0.03 + 0.27 / (1 + np.exp(-time / 15.0))
+                phase = -em * np.cumsum(omega) * dt
+                amp = (0.05 + 0.35 * np.exp(-((time / 40.0) ** 2))) / ell
+                for name, values in [("amp", amp), ("phase", phase)]:
+                    group = h5_file.create_group(f"{name}_l{ell}_m{em}")
+                    group["X"] = time
+                    group["Y"] = values
+
+
+def best_time(func):
+    timings = []
+    for _ in range(num_repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    print(f"{(ell_max + 1) ** 2 - 4} modes, {num_times} samples per mode")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for layout in ["maya", "rit"]:
+            path = os.path.join(tmp_dir, f"{layout}.h5")
+            write_mode_file(path, layout)
+
+            def read(**kwargs):
+                with h5py.File(path, "r") as h5_file:
+                    return waveform.read_modes_from_h5(h5_file, **kwargs)
+
+            for label, kwargs in [("all modes", {}), ("ell_max=2", {"ell_max": 2})]:
+                read_time = best_time(lambda: read(**kwargs))
+                load_time = best_time(
+                    lambda: waveform.WaveformModes.load_from_h5(path, **kwargs)
+                )
+                print(
+                    f"{layout:>5} {label:>10}:"
+                    f" open to arrays {1e3 * read_time:7.1f} ms,"
+                    f" load_from_h5 {1e3 * load_time:7.1f} ms"
+                )
+
+            # Single-mode workflows: load, then access the (2, 2) mode
+            for label, kwargs in [
+                ("all modes", {}),
+                ("(2, +-2)", {"modes": [(2, 2), (2, -2)]}),
+                ("lazy", {"lazy": True}),
+            ]:
+
+                def load_22():
+                    wfm = waveform.WaveformModes.load_from_h5(path, **kwargs)
+                    wfm.get_mode_data(2, 2)
+                    return wfm
+
+                load_time = best_time(load_22)
+                print(
+                    f"{layout:>5} {label:>10}:"
+                    f" load and access (2, 2) {1e3 * load_time:7.1f} ms,"
+                    f" data {load_22().nbytes / 1e6:6.1f} MB"
+                )
+
+            # Repeated loads, from the on-disk cache of resampled modes
+            start = time.perf_counter()
+            waveform.WaveformModes.load_from_h5(path, use_cache=True)
+            first_time = time.perf_counter() - start
+            repeat_time = best_time(
+                lambda: waveform.WaveformModes.load_from_h5(path, use_cache=True)
+            )
+            print(
+                f"{layout:>5} use_cache : first load {1e3 * first_time:7.1f} ms,"
+                f" repeated load {1e3 * repeat_time:7.1f} ms"
+            )
+    tmp_cache_dir.cleanup()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+""" Benchmark scanning many waveform files for the peak amplitude time
+of their (2, 2) modes, reading the datasets into memory or mapping
+them from the files (`read_modes_from_h5(..., mmap=True)`).
+
+Reports the time for the whole scan and the peak memory NumPy
+allocated for the arrays (as traced by `tracemalloc`).
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+libpath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if libpath not in sys.path:
+    sys.path.append(libpath)
+
+import h5py
+import numpy as np
+from nrcatalogtools import waveform
+
+num_files = 50
+num_times = 200000
+
+
+def write_mode_file(path):
+    time = np.linspace(-num_times * 0.1, 100.0, num_times)
+    with h5py.File(path, "w") as h5_file:
+        for ell in range(2, 5):
+            for em in range(-ell, ell + 1):
+                amp = (0.05 + 0.35 * np.exp(-((time / 40.0) ** 2))) / ell
+                for name, values in [("amp", amp), ("phase", -em * time)]:
+                    group = h5_file.create_group(f"{name}_l{ell}_m{em}")
+                    group["X"] = time
+                    group["Y"] = values
+
+
+def scan(paths, mmap):
+    peak_times = []
+    for path in paths:
+        with h5py.File(path, "r") as h5_file:
+            mode_data = waveform.read_modes_from_h5(h5_file, modes=[(2, 2)], mmap=mmap)
+            amp_time, amp, _, _ = mode_data[(2, 2)]
+            peak_times.append(amp_time[np.argmax(amp)])
+    return peak_times
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = [os.path.join(tmp_dir, f"{idx}.h5") for idx in range(num_files)]
+        for path in paths:
+            write_mode_file(path)
+        for mmap in [False, True]:
+            scan(paths, mmap)
+            tracemalloc.start()
+            start = time.perf_counter()
+            scan(paths, mmap)
+            elapsed = time.perf_counter() - start
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"{num_files} files of {num_times} samples, mmap={mmap!s:>5}:"
+                f" {1e3 * elapsed:7.1f} ms, peak allocated {peak_memory / 1e6:6.2f} MB"
+            )
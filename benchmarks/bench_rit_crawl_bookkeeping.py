@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+""" Benchmark the bookkeeping cost of a RIT metadata crawl:
+recording the metadata of each simulation found, and writing
+the metadata table to disk. No network requests are made.
+
+Before: the metadata table is grown with `pd.concat` and
+        rewritten to `metadata.csv` after every simulation.
+After:  each simulation is appended to `RITMetadataJournal`,
+        and the table is built and written once at the end.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+libpath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if libpath not in sys.path:
+    sys.path.append(libpath)
+
+import pandas as pd
+from nrcatalogtools.rit import RITMetadataJournal
+
+num_sims = 2000
+num_fields = 60
+
+
+def fake_sim_data(idx):
+    metadata = {f"field-{n}": [0.001 * idx * n] for n in range(num_fields)}
+    metadata["simulation_name"] = [f"RIT:BBH:{idx:04d}-n100-id0"]
+    metadata["metadata_location"] = [f"/tmp/RIT:BBH:{idx:04d}-n100-id0_Metadata.txt"]
+    return pd.DataFrame.from_dict(metadata)
+
+
+def before(metadata_dir, sims_data):
+    sims = pd.DataFrame({})
+    for sim_data in sims_data:
+        sims = pd.concat([sims, sim_data])
+        with open(metadata_dir / "metadata.csv", "w+") as f:
+            sims.to_csv(f)
+    return sims
+
+
+def after(metadata_dir, sims_data):
+    journal = RITMetadataJournal(metadata_dir / "metadata_journal.jsonl")
+    records = {}
+    for idx, sim_data in enumerate(sims_data, start=1):
+        records[idx] = RITMetadataJournal.record_from_df(sim_data)
+        journal.append(idx, records[idx])
+    sims = pd.DataFrame.from_records([records[idx] for idx in sorted(records)])
+    with open(metadata_dir / "metadata.csv", "w+") as f:
+        sims.to_csv(f)
+    journal.remove()
+    return sims
+
+
+if __name__ == "__main__":
+    sims_data = [fake_sim_data(idx) for idx in range(1, 1 + num_sims)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, func in [("before", before), ("after", after)]:
+            metadata_dir = Path(tmp_dir) / name
+            metadata_dir.mkdir()
+            start = time.perf_counter()
+            sims = func(metadata_dir, sims_data)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:>6}: {elapsed:8.3f} s for {len(sims)} simulations"
+                f" ({1e3 * elapsed / num_sims:.3f} ms per simulation)"
+            )
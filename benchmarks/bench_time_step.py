@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+""" Benchmark estimating the time step of NR time series, with
+`scipy.stats.mode` of the time differences (as previously used)
+and with `utils.estimate_time_step`.
+
+Uniform:     `np.arange` grids, whose steps differ at the level of
+             floating point rounding.
+Non-uniform: time samples with random jitter of the step.
+"""
+
+import os
+import sys
+import time
+
+libpath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if libpath not in sys.path:
+    sys.path.append(libpath)
+
+import numpy as np
+from nrcatalogtools import utils
+from scipy.stats import mode as stat_mode
+
+num_repeats = 5
+
+
+def best_time(func):
+    timings = []
+    for _ in range(num_repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    for num_samples in [10**5, 10**6]:
+        uniform = np.arange(num_samples) * 0.1 - 1e4
+        jittered = np.cumsum(0.1 + 0.01 * rng.random(num_samples))
+        for label, samples in [("uniform", uniform), ("non-uniform", jittered)]:
+            mode_time = best_time(
+                lambda: stat_mode(np.diff(samples), keepdims=True)[0][0]
+            )
+            estimate_time = best_time(lambda: utils.estimate_time_step(samples))
+            print(
+                f"{num_samples:>8} samples, {label:>11}:"
+                f" scipy.stats.mode {1e3 * mode_time:8.2f} ms,"
+                f" estimate_time_step {1e3 * estimate_time:8.2f} ms"
+            )
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+""" Benchmark generating modes and polarizations in physical units from
+the waveform modes of a synthetic 77-mode (ell <= 8) simulation, in the
+MAYA HDF5 layout.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+libpath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if libpath not in sys.path:
+    sys.path.append(libpath)
+
+import h5py
+import numpy as np
+from nrcatalogtools import waveform
+
+ell_max = 8
+num_times = 20000
+num_repeats = 5
+
+
+def write_mode_file(path):
+    dt = 0.5
+    time = np.arange(-num_times * dt + 100.0, 100.0 + 0.5 * dt, dt)
+    omega = 0.03 + 0.27 / (1 + np.exp(-time / 15.0))
+    orbital_phase = np.cumsum(omega) * dt
+    with h5py.File(path, "w") as h5_file:
+        h5_file.attrs["reference_time"] = time[0] + 100.0
+        for name, value in zip(["LNhat", "nhat"], [[0.0, 0.0, 1.0], [1.0, 0.0, 0.0]]):
+            for axis, component in zip("xyz", value):
+                h5_file.attrs[f"{name}{axis}"] = component
+        for ell in range(2, ell_max + 1):
+            for em in range(-ell, ell + 1):
+                amp = (0.05 + 0.35 * np.exp(-((time / 40.0) ** 2))) / ell
+                for name, values in [("amp", amp), ("phase", -em * orbital_phase)]:
+                    group = h5_file.create_group(f"{name}_l{ell}_m{em}")
+                    group["X"] = time
+                    group["Y"] = values
+
+
+def best_time(func):
+    timings = []
+    for _ in range(num_repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "maya.h5")
+        write_mode_file(path)
+        wfm = waveform.WaveformModes.load_from_h5(path)
+        print(f"{wfm.n_modes} modes, {wfm.n_times} samples")
+
+        total_mass, delta_t = 40.0, 1.0 / 16384
+        start = time.perf_counter()
+        wfm.get_mode(2, 2, total_mass, distance=100, delta_t=delta_t)
+        first_get_mode = time.perf_counter() - start
+        get_mode = best_time(
+            lambda: wfm.get_mode(2, 2, total_mass, distance=100, delta_t=delta_t)
+        )
+        h = wfm.get_mode(2, 2, total_mass, distance=100, delta_t=delta_t)
+        print(
+            f"get_mode(2, 2) at M = {total_mass}, {1 / delta_t:.0f} Hz"
+            f" ({len(h)} samples): first call {1e3 * first_get_mode:7.1f} ms,"
+            f" later calls {1e3 * get_mode:7.1f} ms"
+        )
+
+        # Polarizations for many total masses, one at a time and batched
+        total_masses = np.linspace(20.0, 200.0, 100)
+        args = (100.0, 0.4, 0.3)
+        wfm.get_td_waveform(total_mass, *args, delta_t=delta_t)
+        start = time.perf_counter()
+        for total_mass in total_masses:
+            wfm.get_td_waveform(total_mass, *args, delta_t=delta_t)
+        looped = time.perf_counter() - start
+        start = time.perf_counter()
+        wfm.get_td_waveforms(total_masses, *args, delta_t=delta_t)
+        batched = time.perf_counter() - start
+        print(
+            f"{len(total_masses)} total masses, {1 / delta_t:.0f} Hz:"
+            f" get_td_waveform loop {1e3 * looped:7.1f} ms,"
+            f" get_td_waveforms {1e3 * batched:7.1f} ms"
+        )
+
+        # Polarizations for many orientations, one at a time and batched
+        rng = np.random.default_rng(0)
+        inclinations = np.arccos(rng.uniform(-1, 1, 200))
+        coa_phases = rng.uniform(0, 2 * np.pi, 200)
+        start = time.perf_counter()
+        for inclination, coa_phase in zip(inclinations, coa_phases):
+            wfm.get_polarizations(inclination, coa_phase)
+        looped = time.perf_counter() - start
+        start = time.perf_counter()
+        wfm.get_polarizations_batch(inclinations, coa_phases)
+        batched = time.perf_counter() - start
+        print(
+            f"{len(inclinations)} orientations:"
+            f" get_polarizations loop {1e3 * looped:7.1f} ms,"
+            f" get_polarizations_batch {1e3 * batched:7.1f} ms"
+        )
+
+        # Rotation angles of many observers
+        inclinations = np.linspace(0, np.pi, 1000)
+        start = time.perf_counter()
+        for inclination in inclinations:
+            wfm.get_angles(inclination, 0.3)
+        angles_time = time.perf_counter() - start
+        batch_time = best_time(lambda: wfm.get_angles_batch(inclinations, 0.3))
+        print(
+            f"{len(inclinations)} observers:"
+            f" get_angles loop {1e3 * angles_time:7.1f} ms,"
+            f" get_angles_batch {1e3 * batch_time:7.2f} ms"
+        )
+
+        # Resampling all modes in amplitude and phase, with a spline per mode
+        # and amplitude or phase (as `waveformtools.interp_resam_wfs`), and
+        # with `interpolate_in_amp_phase`
+        from scipy.interpolate import InterpolatedUnivariateSpline
+
+        def per_series(new_time):
+            resampled = np.empty((len(new_time), wfm.n_modes), dtype=complex)
+            for idx in range(wfm.n_modes):
+                mode = wfm.ndarray[:, idx]
+                amp = InterpolatedUnivariateSpline(wfm.time, np.abs(mode))
+                phase = InterpolatedUnivariateSpline(
+                    wfm.time, np.unwrap(np.angle(mode))
+                )
+                resampled[:, idx] = amp(new_time) * np.exp(1j * phase(new_time))
+            return resampled
+
+        new_times = [wfm.time[:-1] + shift for shift in np.linspace(0, 0.5, 10)]
+        per_series_time = best_time(lambda: per_series(new_times[0]))
+        resample_time = best_time(
+            lambda: waveform.interpolate_in_amp_phase(wfm, new_times[0])
+        )
+        print(
+            f"resample {wfm.n_modes} modes in amplitude and phase:"
+            f" per series {1e3 * per_series_time:7.1f} ms,"
+            f" interpolate_in_amp_phase {1e3 * resample_time:7.1f} ms"
+        )
+
+        def rebuild():
+            for new_time in new_times:
+                waveform.interpolate_in_amp_phase(wfm, new_time)
+
+        def reuse():
+            interpolant = waveform.AmpPhaseInterpolant(wfm.time, wfm.ndarray)
+            for new_time in new_times:
+                interpolant(new_time)
+
+        print(
+            f"resample onto {len(new_times)} grids:"
+            f" interpolate_in_amp_phase {1e3 * best_time(rebuild):7.1f} ms,"
+            f" one AmpPhaseInterpolant {1e3 * best_time(reuse):7.1f} ms"
+        )
+
+        # First call of get_angles, which finds the NR reference time and
+        # phases, with the reference time in the file or from Omega
+        def first_get_angles(metadata):
+            fresh = waveform.WaveformModes.load_from_h5(path, metadata=metadata)
+            start = time.perf_counter()
+            fresh.get_angles(0.4, 0.3)
+            return time.perf_counter() - start
+
+        first_angles = min(first_get_angles({}) for _ in range(num_repeats))
+        with h5py.File(path, "a") as h5_file:
+            del h5_file.attrs["reference_time"]
+        metadata = {"Omega": -0.035}
+        first_angles_omega = min(first_get_angles(metadata) for _ in range(num_repeats))
+        print(
+            f"first get_angles call:"
+            f" reference time in file {1e3 * first_angles:6.2f} ms,"
+            f" from Omega {1e3 * first_angles_omega:6.2f} ms"
+        )
@@ -0,0 +1,41 @@
+#!/bin/env python
+"""Download the waveform data of the simulations in an NR catalog"""
+
+import argparse
+
+from nrcatalogtools.maya import MayaCatalog
+from nrcatalogtools.rit import RITCatalog
+from nrcatalogtools.sxs import SXSCatalog
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument("catalog", choices=["maya", "rit", "sxs"], help="catalog to use")
+parser.add_argument(
+    "sim_names",
+    nargs="*",
+    help="simulations to download (default: all simulations in the catalog)",
+)
+parser.add_argument(
+    "--workers", type=int, default=8, help="number of concurrent downloads"
+)
+parser.add_argument(
+    "--no-cache",
+    action="store_true",
+    help="download files again even if they are already on disk",
+)
+parser.add_argument("--verbosity", type=int, default=0)
+args = parser.parse_args()
+
+if args.catalog == "maya":
+    catalog = MayaCatalog.load(verbosity=args.verbosity, download=True)
+elif args.catalog == "rit":
+    catalog = RITCatalog.load(verbosity=args.verbosity, download=True)
+else:
+    catalog = SXSCatalog(SXSCatalog.load(download=True)._dict, verbosity=args.verbosity)
+
+summary = catalog.download_all(
+    sim_names=args.sim_names or None,
+    workers=args.workers,
+    use_cache=not args.no_cache,
+)
+if summary["failed"]:
+    raise SystemExit(1)
@@ -4,7 +4,7 @@ catalogs generated via Numerical Relativity simulations
 """
 from __future__ import absolute_import
 
-from . import lvc, maya, rit, sxs, utils, waveform
+from . import cache, lvc, maya, rit, sxs, utils, waveform
 from .maya import MayaCatalog
 from .rit import RITCatalog
 from .sxs import SXSCatalog
@@ -0,0 +1,282 @@
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from nrcatalogtools import utils
+
+# Bump this whenever the layout of cached data changes,
+# to invalidate caches written by older versions.
+cache_format_version = 1
+
+
+def _columnar_format():
+    """Feather (via pyarrow) if available, otherwise pickle"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "pickle"
+    return "feather"
+
+
+def _source_key(source_path):
+    """Identify the current state of a file by its size and
+    modification time"""
+    stat = os.stat(source_path)
+    return {
+        "source": str(source_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "format_version": cache_format_version,
+    }
+
+
+def dataframe_cache_path(source_path):
+    """Path of the binary cache of the table parsed from `source_path`"""
+    source_path = pathlib.Path(source_path)
+    return source_path.with_name(source_path.name + ".cache")
+
+
+def read_dataframe_cache(source_path, cache_path=None):
+    """Read a table parsed from `source_path` from its binary cache.
+
+    The cache is only used if it was written from the same state of the
+    source file, i.e. the size and modification time of `source_path`
+    are those recorded when the cache was written (and the cache was
+    written by this version of the cache format). Otherwise, the cache is
+    stale and ignored.
+
+    Args:
+        source_path (str or Path): file the table was parsed from
+        cache_path (str or Path, optional): path of the cache. Defaults
+            to `dataframe_cache_path(source_path)`.
+
+    Returns:
+        pandas.DataFrame: the cached table, or None if there is no valid
+            cache for the current state of `source_path`.
+    """
+    if cache_path is None:
+        cache_path = dataframe_cache_path(source_path)
+    cache_path = pathlib.Path(cache_path)
+    key_path = cache_path.with_name(cache_path.name + ".json")
+    if not os.path.exists(source_path) or not key_path.exists():
+        return None
+    try:
+        with open(key_path, "r") as f:
+            key = json.load(f)
+        cache_format = key.pop("format")
+        if key != _source_key(source_path):
+            return None
+        if cache_format == "feather":
+            return pd.read_feather(cache_path)
+        return pd.read_pickle(cache_path)
+    except Exception:
+        return None
+
+
+def write_dataframe_cache(df, source_path, cache_path=None):
+    """Write a table parsed from `source_path` to a binary cache, that
+    `read_dataframe_cache` can read back in a single bulk read.
+
+    Args:
+        df (pandas.DataFrame): table parsed from `source_path`
+        source_path (str or Path): file the table was parsed from
+        cache_path (str or Path, optional): path of the cache. Defaults
+            to `dataframe_cache_path(source_path)`.
+
+    Returns:
+        bool: Whether the cache was written
+    """
+    if cache_path is None:
+        cache_path = dataframe_cache_path(source_path)
+    cache_path = pathlib.Path(cache_path)
+    key_path = cache_path.with_name(cache_path.name + ".json")
+    temp_path = cache_path.with_name(cache_path.name + ".temp")
+    key = _source_key(source_path)
+    key["format"] = _columnar_format()
+    try:
+        # Invalidate any previous cache before replacing it
+        try:
+            key_path.unlink()
+        except FileNotFoundError:
+            pass
+        # Both formats store a table with a default index
+        df = df.reset_index(drop=True)
+        if key["format"] == "feather":
+            df.to_feather(temp_path)
+        else:
+            df.to_pickle(temp_path)
+        temp_path.replace(cache_path)
+        with open(key_path, "w") as f:
+            json.dump(key, f)
+    except Exception:
+        try:
+            temp_path.unlink()
+        except FileNotFoundError:
+            pass
+        return False
+    return True
+
+
+def read_json_cache(cache_path, key):
+    """Read data written by `write_json_cache` with the same key.
+
+    Args:
+        cache_path (str or Path): path of the cache
+        key (dict): identifies the state of the data the cache was
+            computed from
+
+    Returns:
+        The cached data, or None if there is no cache for `key`.
+    """
+    key = dict(key, format_version=cache_format_version)
+    try:
+        with open(cache_path, "r") as f:
+            cached = json.load(f)
+        if cached["key"] != key:
+            return None
+        return cached["data"]
+    except Exception:
+        return None
+
+
+def write_json_cache(cache_path, key, data):
+    """Write JSON-serializable data to a cache, that `read_json_cache`
+    reads back for the same key.
+
+    Args:
+        cache_path (str or Path): path of the cache
+        key (dict): identifies the state of the data the cache was
+            computed from
+        data: data to cache
+
+    Returns:
+        bool: Whether the cache was written
+    """
+    cache_path = pathlib.Path(cache_path)
+    temp_path = cache_path.with_name(cache_path.name + ".temp")
+    key = dict(key, format_version=cache_format_version)
+    try:
+        with open(temp_path, "w") as f:
+            json.dump({"key": key, "data": data}, f)
+        temp_path.replace(cache_path)
+    except Exception:
+        try:
+            temp_path.unlink()
+        except FileNotFoundError:
+            pass
+        return False
+    return True
+
+
+def _array_cache_entry(source_path, key, cache_dir):
+    """Directory holding the arrays computed from the current state of
+    `source_path` with the parameters in `key`"""
+    key = dict(_source_key(source_path), **key)
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+    return pathlib.Path(cache_dir) / digest
+
+
+def read_array_cache(source_path, key, cache_dir=None):
+    """Memory-map arrays written by `write_array_cache` for the current
+    state of `source_path` and the same key.
+
+    The arrays are mapped copy-on-write: they can be modified in memory,
+    without changing the cache.
+
+    Args:
+        source_path (str or Path): file the arrays were computed from
+        key (dict): parameters the arrays were computed with
+        cache_dir (str or Path, optional): directory of the cache.
+            Defaults to `utils.waveform_cache_info["cache_dir"]`.
+
+    Returns:
+        dict: name -> numpy.memmap, or None if there is no cache for the
+            current state of `source_path` and `key`.
+    """
+    if cache_dir is None:
+        cache_dir = utils.waveform_cache_info["cache_dir"]
+    try:
+        entry = _array_cache_entry(source_path, key, cache_dir)
+        if not entry.is_dir():
+            return None
+        arrays = {
+            path.stem: np.load(path, mmap_mode="c") for path in entry.glob("*.npy")
+        }
+        # Mark the entry as recently used
+        os.utime(entry)
+    except Exception:
+        return None
+    return arrays or None
+
+
+def write_array_cache(source_path, key, arrays, cache_dir=None, max_bytes=None):
+    """Write arrays computed from `source_path` to a cache, as `.npy`
+    files that `read_array_cache` memory-maps. Then evict the least
+    recently used entries of the cache beyond its size limit.
+
+    Args:
+        source_path (str or Path): file the arrays were computed from
+        key (dict): parameters the arrays were computed with
+        arrays (dict): name -> numpy.ndarray of the arrays to write
+        cache_dir (str or Path, optional): directory of the cache.
+            Defaults to `utils.waveform_cache_info["cache_dir"]`.
+        max_bytes (int, optional): size limit of the cache. Defaults to
+            `utils.waveform_cache_info["max_bytes"]`.
+
+    Returns:
+        bool: Whether the arrays were written
+    """
+    if cache_dir is None:
+        cache_dir = utils.waveform_cache_info["cache_dir"]
+    entry = _array_cache_entry(source_path, key, cache_dir)
+    temp_entry = entry.with_name(f"{entry.name}.temp{os.getpid()}")
+    try:
+        temp_entry.mkdir(parents=True, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(temp_entry / f"{name}.npy", array)
+        try:
+            temp_entry.rename(entry)
+        except OSError:
+            # Another process wrote the same entry first
+            shutil.rmtree(temp_entry)
+    except Exception:
+        shutil.rmtree(temp_entry, ignore_errors=True)
+        return False
+    evict_array_cache(cache_dir, max_bytes)
+    return True
+
+
+def evict_array_cache(cache_dir=None, max_bytes=None):
+    """Delete the least recently used entries of an array cache until its
+    size is within the limit.
+
+    Args:
+        cache_dir (str or Path, optional): directory of the cache.
+            Defaults to `utils.waveform_cache_info["cache_dir"]`.
+        max_bytes (int, optional): size limit of the cache. Defaults to
+            `utils.waveform_cache_info["max_bytes"]`.
+    """
+    if cache_dir is None:
+        cache_dir = utils.waveform_cache_info["cache_dir"]
+    if max_bytes is None:
+        max_bytes = utils.waveform_cache_info["max_bytes"]
+    entries = []
+    for entry in pathlib.Path(cache_dir).iterdir():
+        if not entry.is_dir() or ".temp" in entry.name:
+            continue
+        try:
+            size = sum(path.stat().st_size for path in entry.iterdir())
+            entries.append((entry.stat().st_mtime_ns, size, entry))
+        except FileNotFoundError:
+            continue
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total_size <= max_bytes:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total_size -= size
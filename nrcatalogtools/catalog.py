@@ -1,8 +1,163 @@
+import collections.abc
 import os
+import threading
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import numpy as np
+import pandas as pd
 import sxs
-from nrcatalogtools import waveform
+from tqdm import tqdm
+
+from nrcatalogtools import utils, waveform
+
+
+def simulations_from_dataframe(df, name_column):
+    """Per-simulation metadata from a table with one row per simulation.
+    If a simulation appears in more than one row, the last one is used.
+
+    Args:
+        df (pandas.DataFrame): metadata table
+        name_column (str): column holding the simulation names
+
+    Returns:
+        SimulationsView: simulation name -> dict of metadata (including
+            the name)
+    """
+    return SimulationsView(
+        df.drop_duplicates(name_column, keep="last").set_index(name_column, drop=False)
+    )
+
+
+def _native(value):
+    """Convert numpy scalars to the equivalent python scalars"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _sxs_metadata(metadata):
+    if "metadata_path" in metadata:
+        metadata["metadata_path"] = metadata["metadata_path"].replace(
+            "/Users/boyle/.sxs/cache/", ""
+        )
+    return sxs.Metadata(metadata)
+
+
+class SimulationsView(collections.abc.Mapping):
+    """Read-only map from simulation names to their metadata.
+
+    The metadata dict of a simulation is only assembled, from its row of
+    the catalog table or from its raw metadata dict, when it is first
+    accessed. Columns derived from the simulation name (such as file
+    paths) are filled in at the same time, so building a catalog does not
+    cost anything per simulation.
+
+    Args:
+        simulations (pandas.DataFrame or dict): catalog table indexed by
+            simulation name, or map of simulation names to metadata dicts
+        wrapper (callable, optional): applied to every metadata dict
+            once it has been assembled. Defaults to None.
+    """
+
+    def __init__(self, simulations, wrapper=None):
+        if isinstance(simulations, pd.DataFrame):
+            self._table = simulations
+            self._raw = None
+            self._positions = {
+                sim_name: position
+                for position, sim_name in enumerate(simulations.index)
+            }
+            self._columns = {
+                column: simulations[column].to_numpy() for column in simulations.columns
+            }
+        else:
+            self._table = None
+            self._raw = simulations
+        self._wrapper = wrapper
+        self._derived_columns = {}
+        self._metadata = {}
+
+    def add_derived_column(self, column, func):
+        """Fill in `column` for simulations that do not have it
+
+        Args:
+            column (str): name of the column
+            func (callable): computes the value of the column from the
+                simulation name
+        """
+        self._derived_columns[column] = func
+        self._metadata.clear()
+
+    def set_wrapper(self, wrapper):
+        """Set the callable applied to every assembled metadata dict"""
+        self._wrapper = wrapper
+        self._metadata.clear()
+
+    def __getitem__(self, sim_name):
+        try:
+            return self._metadata[sim_name]
+        except KeyError:
+            pass
+        if self._raw is not None:
+            metadata = dict(self._raw[sim_name])
+        else:
+            position = self._positions[sim_name]
+            metadata = {
+                column: _native(values[position])
+                for column, values in self._columns.items()
+            }
+        for column, func in self._derived_columns.items():
+            if column not in metadata:
+                metadata[column] = func(sim_name)
+        if self._wrapper is not None:
+            metadata = self._wrapper(metadata)
+        self._metadata[sim_name] = metadata
+        return metadata
+
+    def __contains__(self, sim_name):
+        if self._raw is not None:
+            return sim_name in self._raw
+        return sim_name in self._positions
+
+    def __iter__(self):
+        if self._raw is not None:
+            return iter(self._raw)
+        return iter(self._positions)
+
+    def __len__(self):
+        if self._raw is not None:
+            return len(self._raw)
+        return len(self._positions)
+
+    def column(self, column):
+        """Values of `column` for all simulations, in iteration order,
+        without assembling their metadata. Derived columns are not
+        included, and missing values are None.
+
+        Args:
+            column (str): name of the column
+
+        Returns:
+            list: one value per simulation
+        """
+        if self._raw is not None:
+            return [metadata.get(column) for metadata in self._raw.values()]
+        if column not in self._columns:
+            return [None] * len(self)
+        return self._columns[column].tolist()
+
+    def to_dataframe(self):
+        """Metadata of all simulations as a table, indexed by simulation
+        name, including the derived columns"""
+        if self._table is None:
+            return pd.DataFrame.from_dict(dict(self.items()), orient="index")
+        df = self._table.copy()
+        for column, func in self._derived_columns.items():
+            if column not in df.columns:
+                df[column] = [func(sim_name) for sim_name in df.index]
+        return df
 
 
 class CatalogABC(ABC):
@@ -32,19 +187,126 @@ class CatalogABC(ABC):
 
 
 class CatalogBase(CatalogABC, sxs.Catalog):
-    def __init__(self, *args, **kwargs) -> None:
-        sxs.Catalog.__init__(self, *args, **kwargs)
+    # Bounds of the in-memory cache of waveforms returned by `get`
+    waveform_cache_max_entries = 8
+    waveform_cache_max_bytes = 2 * 1024**3
+
+    def __init__(self, catalog=None, **kwargs) -> None:
+        # Unlike sxs.Catalog, which wraps the metadata of every simulation
+        # in sxs.Metadata up front, only do so when a simulation is accessed
+        if catalog is None:
+            catalog = type(self).load(**kwargs)._dict
+        self._dict = catalog
+        simulations = self._dict["simulations"]
+        if not isinstance(simulations, SimulationsView):
+            simulations = SimulationsView(simulations)
+        simulations.set_wrapper(_sxs_metadata)
+        self._dict["simulations"] = simulations
+        self._name_index = None
+        self._waveforms = collections.OrderedDict()
+        self._waveforms_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     @property
     def simulations_list(self):
         return list(self.simulations)
 
-    def get(self, sim_name):
-        if sim_name not in self.simulations_dataframe.index.to_list():
+    def _simulation_aliases(self):
+        """Alternative names of simulations, as (alias, simulation name)
+        pairs. Catalogs that have other names for their simulations
+        override this."""
+        return []
+
+    @property
+    def name_index(self):
+        """Map of names to the simulations they refer to, built once on
+        first use. This includes the simulation names, their aliases, and
+        the lower case versions of both. Names that refer to more than one
+        simulation map to None."""
+        if self._name_index is None:
+            names = list(self.simulations)
+            aliases = list(self._simulation_aliases())
+            # Simulation names take precedence over aliases, which take
+            # precedence over case-insensitive matches
+            tiers = [
+                [(name, name) for name in names],
+                aliases,
+                [(name.lower(), name) for name in names]
+                + [(alias.lower(), name) for alias, name in aliases],
+            ]
+            name_index = {}
+            for tier in tiers:
+                found = {}
+                for key, name in tier:
+                    if key in name_index:
+                        continue
+                    if found.setdefault(key, name) != name:
+                        found[key] = None
+                name_index.update(found)
+            self._name_index = name_index
+        return self._name_index
+
+    def resolve_simulation_name(self, sim_name):
+        """Name of the simulation that `sim_name` refers to
+
+        Args:
+            sim_name (str): Name, alias, or case-insensitive version of
+                either, of a simulation
+
+        Returns:
+            str: Name of the simulation in the catalog
+        """
+        name_index = self.name_index
+        key = sim_name if sim_name in name_index else str(sim_name).lower()
+        if key not in name_index:
             raise IOError(
                 f"Simulation {sim_name} not found in catalog."
                 f"Please check that it exists"
             )
+        if name_index[key] is None:
+            raise IOError(
+                f"Simulation name {sim_name} is ambiguous in this catalog."
+                f"Please use the full simulation name"
+            )
+        return name_index[key]
+
+    def get(self, sim_name, modes=None, lazy=False, use_cache=False):
+        """Waveform modes of a simulation, downloading its data if needed.
+
+        The most recently used waveforms are kept in memory (up to
+        `waveform_cache_max_entries` of them, and
+        `waveform_cache_max_bytes` of data), and the same object is
+        returned when one of them is requested again.
+
+        Args:
+            sim_name (str): Name of the simulation
+            modes (list of (int, int), optional): (ell, em) of the modes
+                to load. Defaults to all modes.
+            lazy (bool, optional): Only read the data of each mode when it
+                is first accessed. Defaults to False.
+            use_cache (bool, optional): Memory-map the resampled modes from
+                the on-disk cache of resampled waveforms, and add them to it
+                if they are not cached yet. The cache lives in
+                `utils.waveform_cache_info["cache_dir"]`, and the least
+                recently used entries are evicted once it holds more than
+                `utils.waveform_cache_info["max_bytes"]` (4 GiB by default).
+                Defaults to False.
+
+        Returns:
+            WaveformModes: Waveform modes of the simulation
+        """
+        sim_name = self.resolve_simulation_name(sim_name)
+        if modes is not None:
+            modes = tuple(sorted(set(tuple(mode) for mode in modes)))
+        key = (sim_name, modes, lazy)
+        with self._waveforms_lock:
+            if key in self._waveforms:
+                self._waveforms.move_to_end(key)
+                self.cache_hits += 1
+                return self._waveforms[key]
+            self.cache_misses += 1
+
         filepath = self.waveform_filepath_from_simname(sim_name)
         if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
             if self._verbosity > 1:
@@ -58,16 +320,130 @@ class CatalogBase(CatalogABC, sxs.Catalog):
         metadata = self.get_metadata(sim_name)
         if type(metadata) is not dict and hasattr(metadata, "to_dict"):
             metadata = metadata.to_dict()
-        return waveform.WaveformModes.load_from_h5(filepath, metadata=metadata)
+        wfm = waveform.WaveformModes.load_from_h5(
+            filepath, metadata=metadata, modes=modes, lazy=lazy, use_cache=use_cache
+        )
+        self._cache_waveform(key, wfm)
+        return wfm
+
+    def _cache_waveform(self, key, wfm):
+        """Keep a waveform in the in-memory cache, evicting the least
+        recently used ones beyond the bounds of the cache"""
+        if wfm.nbytes > self.waveform_cache_max_bytes:
+            return
+        with self._waveforms_lock:
+            self._waveforms[key] = wfm
+            self._waveforms.move_to_end(key)
+            total_bytes = sum(w.nbytes for w in self._waveforms.values())
+            while (
+                len(self._waveforms) > self.waveform_cache_max_entries
+                or total_bytes > self.waveform_cache_max_bytes
+            ):
+                _, evicted = self._waveforms.popitem(last=False)
+                total_bytes -= evicted.nbytes
+
+    def clear_cache(self):
+        """Empty the in-memory cache of waveforms, and reset its hit and
+        miss counts"""
+        with self._waveforms_lock:
+            self._waveforms.clear()
+            self.cache_hits = 0
+            self.cache_misses = 0
 
     def get_metadata(self, sim_name):
-        sim_dict = self.simulations
-        if sim_name not in list(sim_dict.keys()):
-            raise IOError(
-                f"Simulation {sim_name} not found in catalog."
-                f"Please check that it exists"
+        return self.simulations[self.resolve_simulation_name(sim_name)]
+
+    def download_targets(self, sim_name):
+        """Files to download for a simulation
+
+        Args:
+            sim_name (str): Name of the simulation
+
+        Returns:
+            list: (url, local path, size in bytes, MD5 checksum) of each
+                file, where size and checksum are None if not known
+        """
+        return [
+            (
+                self.waveform_url_from_simname(sim_name),
+                self.waveform_filepath_from_simname(sim_name),
+                None,
+                None,
+            )
+        ]
+
+    def download_all(self, sim_names=None, workers=8, use_cache=True, progress=True):
+        """Download the waveform data of many simulations concurrently.
+
+        Interrupted downloads are resumed where they stopped the next time
+        they are attempted, and every file is only moved into place once it
+        is complete (and its size and checksum verified, where known).
+
+        Args:
+            sim_names (list of str, optional): Simulations to download.
+                Defaults to all simulations in the catalog.
+            workers (int, optional): Maximum number of concurrent
+                downloads. Defaults to 8.
+            use_cache (bool, optional): Skip files that are already on
+                disk. Defaults to True.
+            progress (bool, optional): Show a progress bar, and print a
+                summary at the end. Defaults to True.
+
+        Returns:
+            dict: Names of the simulations "downloaded" and already
+                "cached", map of the simulations that "failed" to their
+                errors, and the number of "bytes" downloaded.
+        """
+        if sim_names is None:
+            sim_names = self.simulations_list
+        sim_names = [self.resolve_simulation_name(s) for s in sim_names]
+
+        def download(sim_name):
+            num_bytes = 0
+            for url, path, filesize, checksum in self.download_targets(sim_name):
+                if (
+                    use_cache
+                    and os.path.exists(path)
+                    and os.path.getsize(path) > 0
+                    and filesize in (None, os.path.getsize(path))
+                ):
+                    continue
+                path = utils.download_file_resumable(
+                    url, path, filesize=filesize, checksum=checksum
+                )
+                num_bytes += os.path.getsize(path)
+            return num_bytes
+
+        summary = {"downloaded": [], "cached": [], "failed": {}, "bytes": 0}
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(download, s): s for s in sim_names}
+            for future in tqdm(
+                as_completed(futures), total=len(futures), disable=not progress
+            ):
+                sim_name = futures[future]
+                try:
+                    num_bytes = future.result()
+                except Exception as e:
+                    summary["failed"][sim_name] = e
+                    continue
+                if num_bytes > 0:
+                    summary["downloaded"].append(sim_name)
+                    summary["bytes"] += num_bytes
+                else:
+                    summary["cached"].append(sim_name)
+
+        if progress:
+            elapsed = time.perf_counter() - start
+            print(
+                f"Downloaded {len(summary['downloaded'])} simulations"
+                f" ({summary['bytes'] / 1e6:.1f} MB in {elapsed:.1f} s),"
+                f" {len(summary['cached'])} already cached,"
+                f" {len(summary['failed'])} failed"
             )
-        return sim_dict[sim_name]
+            for sim_name, error in summary["failed"].items():
+                print(f"  {sim_name}: {error}")
+        return summary
 
     def set_attribute_in_waveform_data_file(self, sim_name, attr_name, attr_value):
         """Set attributes in the HDF5 file holding waveform data for a given
@@ -709,13 +709,40 @@ def get_nr_to_lal_rotation_angles(
     The reference epoch is defined close to the beginning of the simulation.
     """
 
+    lal_frame = get_nr_to_lal_frame(h5_file, sim_metadata, f_ref=f_ref, t_ref=t_ref)
+
+    return get_rotation_angles_from_lal_frame(
+        lal_frame, inclination, phi_ref=phi_ref, tol=tol
+    )
+
+
+def get_nr_to_lal_frame(h5_file, sim_metadata, f_ref=None, t_ref=None):
+    """Get the basis vectors of the LAL source frame, in the NR source
+    frame, at the reference time.
+
+    This does not depend on the observer, and only needs to be computed
+    once for a given reference time or frequency.
+
+    Parameters
+    ----------
+    h5_file : file object
+            The waveform h5 file handle.
+    sim_metadata : dict
+               The sim_metadata of the waveform file.
+    f_ref, t_ref : float, optional
+                 The reference orbital frequency or time
+
+    Returns
+    -------
+    lal_frame : dict
+                The direction of the orbital angular momentum `ln_hat` and
+                the direction from object 2 to object 1 `n_hat`, and the
+                reference time and frequency.
+    """
+
     # Compute the angles necessary to rotate from the intrinsic NR source frame
     # into the LAL frame. See DCC-T1600045 for details.
 
-    # Following section IV of DCC-T1600045
-    # Step 1: Define Phi = phiref
-    orb_phase = phi_ref
-
     ##########################################
     # Step 2: Compute Zref
     # 2.1 : Check if interpolation is required in IntReq
@@ -858,16 +885,53 @@ def get_nr_to_lal_rotation_angles(
         # fRef for a non-precessing simulation.\n")
 
     # Get the LAL source frame vectors
-    ln_hat_x = ref_params["LNhatx"]
-    ln_hat_y = ref_params["LNhaty"]
-    ln_hat_z = ref_params["LNhatz"]
+    ln_hat = np.array([ref_params[f"LNhat{axis}"] for axis in "xyz"])
+    n_hat = np.array([ref_params[f"nhat{axis}"] for axis in "xyz"])
+
+    lal_frame = {
+        "ln_hat": ln_hat,
+        "n_hat": n_hat,
+        "t_ref": t_ref,
+        "f_ref": f_ref,
+    }
+
+    return lal_frame
+
+
+def get_rotation_angles_from_lal_frame(lal_frame, inclination, phi_ref=0, tol=1e-6):
+    r"""Get the angular coordinates :math:`\theta, \phi`
+    and the rotation angle :math:`\alpha` of an observer from the
+    LAL source frame.
+
+    Parameters
+    ----------
+    lal_frame : dict
+                The LAL source frame, as returned by `get_nr_to_lal_frame`.
+    inclination : float
+                  The inclination angle.
+    phi_ref : float
+             The orbital phase at reference time.
+    tol : float
+          The tolerance to use to allow floating point
+            representation errors.
 
-    n_hat_x = ref_params["nhatx"]
-    n_hat_y = ref_params["nhaty"]
-    n_hat_z = ref_params["nhatz"]
+    Returns
+    -------
+    angles : dict
+             The angular corrdinates Theta, Psi,  and the rotation angle Alpha.
+             If available, this also contains the reference time and frequency.
+    """
+
+    # Following section IV of DCC-T1600045
+    # Step 1: Define Phi = phiref
+    orb_phase = phi_ref
 
-    ln_hat = np.array([ln_hat_x, ln_hat_y, ln_hat_z])
-    n_hat = np.array([n_hat_x, n_hat_y, n_hat_z])
+    # Get the LAL source frame vectors
+    ln_hat = lal_frame["ln_hat"]
+    n_hat = lal_frame["n_hat"]
+
+    ln_hat_x, ln_hat_y, ln_hat_z = ln_hat
+    n_hat_x, n_hat_y, n_hat_z = n_hat
 
     # 2.3: Carryout vector math to get Zref in the lal wave frame
     corb_phase = np.cos(orb_phase)
@@ -990,8 +1054,187 @@ def get_nr_to_lal_rotation_angles(
         "theta": theta,
         "psi": psi,
         "alpha": alpha,
-        "t_ref": t_ref,
-        "f_ref": f_ref,
+        "t_ref": lal_frame["t_ref"],
+        "f_ref": lal_frame["f_ref"],
+    }
+
+    return angles
+
+
+def get_nr_to_lal_rotation_angles_array(
+    h5_file, sim_metadata, inclinations, phi_refs=0, f_ref=None, t_ref=None, tol=1e-6
+):
+    r"""Get the angular coordinates :math:`\theta, \phi`
+    and the rotation angle :math:`\alpha` from the H5 file, for arrays
+    of inclinations and reference orbital phases.
+
+    Parameters
+    ----------
+    h5_file : file object
+            The waveform h5 file handle.
+    sim_metadata : dict
+               The sim_metadata of the waveform file.
+    inclinations : array_like
+                  The inclination angles.
+    phi_refs : array_like
+             The orbital phases at reference time, broadcast against
+             `inclinations`.
+    f_ref, t_ref : float, optional
+                 The reference orbital frequency or time
+    tol : float
+          The tolerance to use to allow floating point
+            representation errors.
+
+    Returns
+    -------
+    angles : dict
+             The arrays of angular corrdinates Theta, Psi, and the rotation
+             angle Alpha, as from `get_nr_to_lal_rotation_angles` for every
+             inclination and reference phase. If available, this also
+             contains the reference time and frequency.
+    """
+
+    lal_frame = get_nr_to_lal_frame(h5_file, sim_metadata, f_ref=f_ref, t_ref=t_ref)
+
+    return get_rotation_angles_from_lal_frame_array(
+        lal_frame, inclinations, phi_refs=phi_refs, tol=tol
+    )
+
+
+def get_rotation_angles_from_lal_frame_array(
+    lal_frame, inclinations, phi_refs=0, tol=1e-6
+):
+    r"""Get the angular coordinates :math:`\theta, \phi`
+    and the rotation angle :math:`\alpha` of many observers from the
+    LAL source frame.
+
+    This is the array counterpart of `get_rotation_angles_from_lal_frame`,
+    with the same results for every observer.
+
+    Parameters
+    ----------
+    lal_frame : dict
+                The LAL source frame, as returned by `get_nr_to_lal_frame`.
+    inclinations : array_like
+                  The inclination angles.
+    phi_refs : array_like
+             The orbital phases at reference time, broadcast against
+             `inclinations`.
+    tol : float
+          The tolerance to use to allow floating point
+            representation errors.
+
+    Returns
+    -------
+    angles : dict
+             The arrays of angular corrdinates Theta, Psi, and the rotation
+             angle Alpha. If available, this also contains the reference
+             time and frequency.
+    """
+
+    # Following section IV of DCC-T1600045
+    # Step 1: Define Phi = phiref
+    inclination, orb_phase = np.broadcast_arrays(
+        np.asarray(inclinations, dtype=float), np.asarray(phi_refs, dtype=float)
+    )
+
+    # Get the LAL source frame vectors
+    ln_hat = lal_frame["ln_hat"]
+    n_hat = lal_frame["n_hat"]
+
+    ln_hat_x, ln_hat_y, ln_hat_z = ln_hat
+    n_hat_x, n_hat_y, n_hat_z = n_hat
+
+    # 2.3: Carryout vector math to get Zref in the lal wave frame
+    corb_phase = np.cos(orb_phase)
+    sorb_phase = np.sin(orb_phase)
+    sinclination = np.sin(inclination)
+    cinclination = np.cos(inclination)
+
+    ln_cross_n = np.cross(ln_hat, n_hat)
+    ln_cross_n_x, ln_cross_n_y, ln_cross_n_z = ln_cross_n
+
+    z_wave_x = sinclination * (sorb_phase * n_hat_x + corb_phase * ln_cross_n_x)
+    z_wave_y = sinclination * (sorb_phase * n_hat_y + corb_phase * ln_cross_n_y)
+    z_wave_z = sinclination * (sorb_phase * n_hat_z + corb_phase * ln_cross_n_z)
+
+    z_wave_x += cinclination * ln_hat_x
+    z_wave_y += cinclination * ln_hat_y
+    z_wave_z += cinclination * ln_hat_z
+
+    #################################################################
+    # Step 3.1: Extract theta and psi from Z in the lal wave frame
+    # NOTE: Theta can only run between 0 and pi, so no problem with arccos here
+    theta = np.arccos(z_wave_z)
+    stheta = np.sin(theta)
+
+    # If theta is very close to the poles
+    # use a random value of psi
+    at_pole = np.abs(z_wave_z - 1.0) < tol
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos_psi = z_wave_x / stheta
+
+        # psi can run between 0 and 2pi, but only one solution works for x and y
+        # Possible numerical issues if z_wave_x = sin(theta)
+        beyond_one = ~at_pole & (np.abs(cos_psi) > 1.0)
+        if np.any(beyond_one & ~(np.abs(cos_psi) < (1 + 10 * tol))):
+            # LAL tol retained.
+            raise ValueError(
+                "Z_x cannot be bigger than sin(theta). Please contact the developers."
+            )
+        psi = np.where(
+            beyond_one,
+            np.where((z_wave_x * stheta) < 0.0, np.pi, 0.0),
+            np.arccos(cos_psi),
+        )
+    psi = np.where(at_pole, 0.5, psi)
+
+    # If z_wave[1] is negative, flip psi so that sin(psi) goes negative
+    # while preserving cos(psi)
+    psi = np.where(~at_pole & (z_wave_y < 0.0), 2 * np.pi - psi, psi)
+    y_val = np.sin(psi) * stheta
+
+    if np.any(~at_pole & (np.abs(y_val - z_wave_y) > (5e3 * tol))):
+        # LAL tol retained.
+        raise ValueError("Math consistency failure! Please contact the developers.")
+
+    # 3.2: Compute the vectors psi_hat
+    spsi = np.sin(psi)
+    cpsi = np.cos(psi)
+    psi_hat = np.stack([-spsi, cpsi, np.zeros_like(psi)], axis=-1)
+
+    # Step 4: Compute cos(alpha)
+    # Rotation angles on the tangent plane
+    # due to spin weight.
+    # One dot product per observer, exactly as `np.dot` of single vectors
+    n_dot_psi = np.matmul(psi_hat[..., None, :], n_hat[:, None])[..., 0, 0]
+    ln_cross_n_dot_psi = np.matmul(psi_hat[..., None, :], ln_cross_n[:, None])[
+        ..., 0, 0
+    ]
+
+    calpha = corb_phase * n_dot_psi - sorb_phase * ln_cross_n_dot_psi
+
+    calpha_err = np.abs(calpha) - 1
+    if np.any(calpha_err > 0):
+        if np.any(calpha_err[calpha_err > 0] >= tol):
+            raise ValueError(
+                "Seems like something is wrong with the polarization angle. Please contact the developers!"
+            )
+        print(
+            "Correcting the polarization angle for finite precision error"
+            f" {calpha_err.max()}"
+        )
+        calpha = np.where(calpha_err > 0, calpha / np.abs(calpha), calpha)
+
+    alpha = np.arccos(calpha)
+
+    angles = {
+        "theta": theta,
+        "psi": psi,
+        "alpha": alpha,
+        "t_ref": lal_frame["t_ref"],
+        "f_ref": lal_frame["f_ref"],
     }
 
     return angles
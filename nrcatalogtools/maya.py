@@ -5,7 +5,7 @@ import zipfile
 
 import pandas as pd
 
-from nrcatalogtools import catalog, utils
+from nrcatalogtools import cache, catalog, utils
 
 
 class MayaCatalog(catalog.CatalogBase):
@@ -26,7 +26,6 @@ class MayaCatalog(catalog.CatalogBase):
         self.cache_dir = utils.maya_catalog_info["cache_dir"]
         self.use_cache = use_cache
 
-        self.metadata = pd.DataFrame.from_dict(catalog)
         self.metadata_url = utils.maya_catalog_info["metadata_url"]
         self.metadata_dir = utils.maya_catalog_info["metadata_dir"]
 
@@ -106,6 +105,24 @@ class MayaCatalog(catalog.CatalogBase):
                     f"Catalog not found in '{cache_path}' for unknown reasons"
                 )
 
+        catalog_df = cache.read_dataframe_cache(cache_path)
+        if catalog_df is None:
+            catalog_df = cls._read_catalog_zip(cache_path)
+            cache.write_dataframe_cache(catalog_df, cache_path)
+
+        simulations = catalog.simulations_from_dataframe(catalog_df, "GTID")
+        return cls(catalog={"simulations": simulations}, verbosity=verbosity)
+
+    @staticmethod
+    def _read_catalog_zip(cache_path):
+        """Parse the catalog table stored in `catalog.zip`
+
+        Args:
+            cache_path (Path): path to `catalog.zip`
+
+        Returns:
+            pandas.DataFrame: catalog with one row per simulation
+        """
         try:
             with zipfile.ZipFile(cache_path, "r") as catalog_zip:
                 try:
@@ -133,60 +150,57 @@ class MayaCatalog(catalog.CatalogBase):
         except Exception as e:
             raise ValueError(f"Failed to open '{cache_path}' as a ZIP file") from e
 
-        # Fill in the catalog object
+        # Fill in the catalog object. Missing values are marked with "-",
+        # which (like anything else that is not a number) becomes NaN
         catalog_dict = {}
-        catalog_dict["GTID"] = [s.strip() for s in list(catalog_df.index)]
+        catalog_dict["GTID"] = catalog_df.index.astype(str).str.strip().to_numpy()
 
         for col_name in catalog_df.columns:
-            column = list(catalog_df[col_name])
+            column = catalog_df[col_name]
             if "GT_Tag" in col_name:
-                catalog_dict["GT_Tag"] = [s.strip() for s in column]
+                catalog_dict["GT_Tag"] = column.astype(str).str.strip().to_numpy()
             else:
-                catalog_dict[col_name.strip()] = [
-                    float(s.strip().replace("-", "NAN")) if type(s) == str else float(s)
-                    for s in column
-                ]
-        catalog_df = pd.DataFrame(catalog_dict)
-        catalog = {}
-        simulations = {}
-        for idx, row in catalog_df.iterrows():
-            name = row["GTID"]
-            metadata_dict = row.to_dict()
-            simulations[name] = metadata_dict
-        catalog["simulations"] = simulations
-        return cls(catalog=catalog, verbosity=verbosity)
+                catalog_dict[col_name.strip()] = (
+                    pd.to_numeric(column.astype(str).str.strip(), errors="coerce")
+                    .astype(float)
+                    .to_numpy()
+                )
+        return pd.DataFrame(catalog_dict)
 
-    def _add_paths_to_metadata(self):
-        metadata_dict = self._dict["simulations"]
-        existing_cols = list(metadata_dict[list(metadata_dict.keys())[0]].keys())
-        new_cols = [
-            "metadata_link",
-            "metadata_location",
-            "waveform_data_link",
-            "waveform_data_location",
+    def _simulation_aliases(self):
+        """GT_Tag of each simulation"""
+        return [
+            (tag, sim_name)
+            for tag, sim_name in zip(
+                self.simulations.column("GT_Tag"), self.simulations
+            )
+            if isinstance(tag, str) and tag
         ]
 
-        if any([col not in existing_cols for col in new_cols]):
-            for sim_name in metadata_dict:
-                if "metadata_location" not in existing_cols:
-                    metadata_dict[sim_name]["metadata_location"] = (
-                        self.metadata_filepath_from_simname(sim_name)
-                    )
-                if "metadata_link" not in existing_cols:
-                    metadata_dict[sim_name]["metadata_link"] = self.metadata_url
-                if "waveform_data_link" not in existing_cols:
-                    metadata_dict[sim_name]["waveform_data_link"] = (
-                        self.waveform_data_url + "/" + f"{sim_name}.h5"
-                    )
-                if "waveform_data_location" not in existing_cols:
-                    metadata_dict[sim_name]["waveform_data_location"] = (
-                        self.waveform_filepath_from_simname(sim_name)
-                    )
+    def _add_paths_to_metadata(self):
+        simulations = self._dict["simulations"]
+        simulations.add_derived_column(
+            "metadata_location", self.metadata_filepath_from_simname
+        )
+        simulations.add_derived_column(
+            "metadata_link", lambda sim_name: self.metadata_url
+        )
+        simulations.add_derived_column(
+            "waveform_data_link", self.waveform_url_from_simname
+        )
+        simulations.add_derived_column(
+            "waveform_data_location", self.waveform_filepath_from_simname
+        )
+
+    @property
+    def metadata(self):
+        """Metadata of all simulations, in a single column"""
+        return pd.DataFrame.from_dict({"simulations": dict(self.simulations)})
 
     @property
     @functools.lru_cache()
     def simulations_dataframe(self):
-        df = pd.DataFrame(self.simulations).transpose()
+        df = self.simulations.to_dataframe()
         df.rename(columns={"GTID": "simulation_name"}, inplace=True)
         return df
 
@@ -194,9 +208,11 @@ class MayaCatalog(catalog.CatalogBase):
     @functools.lru_cache()
     def files(self):
         """Map of all file names to the corresponding file info"""
+        df = self.simulations_dataframe
         file_infos = {}
-        for _, row in self.simulations_dataframe.iterrows():
-            waveform_data_location = row["waveform_data_location"]
+        for waveform_data_location, waveform_data_link in zip(
+            df["waveform_data_location"].to_list(), df["waveform_data_link"].to_list()
+        ):
             path_str = os.path.basename(waveform_data_location)
             if os.path.exists(waveform_data_location):
                 file_size = os.path.getsize(waveform_data_location)
@@ -204,9 +220,9 @@ class MayaCatalog(catalog.CatalogBase):
                 file_size = 0
             file_info = {
                 "checksum": None,
-                "filename": os.path.basename(waveform_data_location),
+                "filename": path_str,
                 "filesize": file_size,
-                "download": row["waveform_data_link"],
+                "download": waveform_data_link,
             }
             file_infos[path_str] = file_info
 
@@ -266,11 +282,10 @@ class MayaCatalog(catalog.CatalogBase):
         else:
             if self._verbosity > 2:
                 print("...writing to cache: {}".format(str(local_file_path)))
-            if utils.url_exists(file_path_web):
-                if self._verbosity > 2:
-                    print("...downloading {}".format(file_path_web))
-                utils.download_file(file_path_web, local_file_path)
-            else:
+            if self._verbosity > 2:
+                print("...downloading {}".format(file_path_web))
+            utils.download_file(file_path_web, local_file_path)
+            if not os.path.exists(local_file_path):
                 if self._verbosity > 2:
                     print(
                         "... ... but couldnt find link: {}".format(str(file_path_web))
@@ -1,14 +1,34 @@
 import collections
+import concurrent.futures
 import functools
 import glob
+import json
 import os
-import subprocess
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
 
 import pandas as pd
 import requests
 from tqdm import tqdm
 
-from nrcatalogtools import catalog, utils
+from nrcatalogtools import cache, catalog, utils
+
+
+class _LinkParser(HTMLParser):
+    """Collect the targets of all links on an HTML page"""
+
+    def __init__(self):
+        super().__init__()
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        for name, value in attrs:
+            if name == "href" and value:
+                self.links.append(value)
 
 
 class RITCatalog(catalog.CatalogBase):
@@ -75,14 +95,15 @@ class RITCatalog(catalog.CatalogBase):
                     )
                 )
         # Get the catalog from helper object
-        catalog = {}
-        simulations = {}
-        for idx, row in catalog_df.iterrows():
-            name = row["simulation_name"]
-            metadata_dict = row.to_dict()
-            simulations[name] = metadata_dict
-        catalog["simulations"] = simulations
-        return cls(catalog=catalog, helper=helper, verbosity=verbosity)
+        simulations = catalog.simulations_from_dataframe(catalog_df, "simulation_name")
+        return cls(
+            catalog={"simulations": simulations}, helper=helper, verbosity=verbosity
+        )
+
+    def _simulation_aliases(self):
+        """Simulation tag of each simulation, i.e. its name without the
+        resolution and ID, e.g. RIT:BBH:0001 for RIT:BBH:0001-n100-id3"""
+        return [(sim_name.split("-")[0], sim_name) for sim_name in self.simulations]
 
     @property
     @functools.lru_cache()
@@ -102,9 +123,11 @@ class RITCatalog(catalog.CatalogBase):
     @functools.lru_cache()
     def files(self):
         """Map of all file names to the corresponding file info"""
+        df = self.simulations_dataframe
         file_infos = {}
-        for _, row in self.simulations_dataframe.iterrows():
-            waveform_data_location = row["waveform_data_location"]
+        for waveform_data_location, waveform_data_link in zip(
+            df["waveform_data_location"].to_list(), df["waveform_data_link"].to_list()
+        ):
             path_str = os.path.basename(waveform_data_location)
             if os.path.exists(waveform_data_location):
                 file_size = os.path.getsize(waveform_data_location)
@@ -112,9 +135,9 @@ class RITCatalog(catalog.CatalogBase):
                 file_size = 0
             file_info = {
                 "checksum": None,
-                "filename": os.path.basename(waveform_data_location),
+                "filename": path_str,
                 "filesize": file_size,
-                "download": row["waveform_data_link"],
+                "download": waveform_data_link,
             }
             file_infos[path_str] = file_info
 
@@ -195,6 +218,12 @@ class RITCatalogHelper(object):
         self.possible_res = utils.rit_catalog_info["possible_resolutions"]
         self.max_id_val = utils.rit_catalog_info["max_id_val"]
 
+        self.web_index = None
+
+        self.max_connections_per_host = 16
+        self._host_limits = {}
+        self._host_limits_lock = threading.Lock()
+
         internal_dirs = [self.cache_dir, self.metadata_dir, self.waveform_data_dir]
         for d in internal_dirs:
             d.mkdir(parents=True, exist_ok=True)
@@ -340,13 +369,7 @@ class RITCatalogHelper(object):
             utils.download_file(link, save_to, progress=True)
             return self.metadata_from_file(save_to)
         else:
-            requests.packages.urllib3.disable_warnings()
-            for n in range(100):
-                try:
-                    response = requests.get(link, verify=False)
-                    break
-                except Exception:
-                    continue
+            response = utils.http_session().get(link)
             return self.parse_metadata_txt(response.content.decode().split("\n"))
 
     def metadata_from_file(self, file_path):
@@ -419,36 +442,354 @@ class RITCatalogHelper(object):
 
             if len(metadata_dict) > 0:
                 # Convert to DataFrame and break loop
-                metadata_dict["simulation_name"] = [
-                    self.simname_from_metadata_filename(file_name)
-                ]
-                metadata_dict["metadata_link"] = [file_path_web]
-                metadata_dict["metadata_location"] = [mf]
-                metadata_dict["waveform_data_location"] = [
-                    str(
-                        self.waveform_data_dir
-                        / self.waveform_filename_from_simname(
-                            metadata_dict["simulation_name"][0]
-                        )
-                    )
-                ]
-                break
+                return self.metadata_df_from_dict(file_name, metadata_dict)
 
         sim = pd.DataFrame.from_dict(metadata_dict)
         return sim
 
+    def metadata_df_from_dict(self, file_name, metadata_dict):
+        """Package the parsed metadata of one simulation, along with the
+        location of its metadata and waveform files, into a single-row
+        DataFrame.
+
+        Args:
+            file_name (str): name (not path) of metadata file as hosted on the web
+            metadata_dict (dict): metadata parsed from that file
+
+        Returns:
+            pandas.DataFrame: metadata for the simulation
+        """
+        metadata_dict["simulation_name"] = [
+            self.simname_from_metadata_filename(file_name)
+        ]
+        metadata_dict["metadata_link"] = [self.metadata_url + "/" + file_name]
+        metadata_dict["metadata_location"] = [self.metadata_dir / file_name]
+        metadata_dict["waveform_data_location"] = [
+            str(
+                self.waveform_data_dir
+                / self.waveform_filename_from_simname(
+                    metadata_dict["simulation_name"][0]
+                )
+            )
+        ]
+        return pd.DataFrame.from_dict(metadata_dict)
+
+    def list_web_directory(self, url):
+        """List the names of files in a web directory from its
+        (Apache-style) index page.
+
+        Args:
+            url (str): URL of the web directory
+
+        Returns:
+            list: names of the files listed. Empty if the index page could
+                not be read.
+        """
+        try:
+            response = utils.http_session().get(url)
+        except Exception as excep:
+            if self.verbosity > 2:
+                print("...could not read index page {}: {}".format(url, excep))
+            return []
+        if response.status_code != requests.codes.ok:
+            if self.verbosity > 2:
+                print("...could not read index page {}".format(url))
+            return []
+        parser = _LinkParser()
+        parser.feed(response.content.decode(errors="replace"))
+        file_names = []
+        for link in parser.links:
+            # Skip sorting links, parent and sub-directories
+            if link.startswith("?") or link.endswith("/"):
+                continue
+            file_name = urllib.parse.unquote(
+                urllib.parse.urlparse(link).path.split("/")[-1]
+            )
+            if len(file_name) > 0 and file_name not in file_names:
+                file_names.append(file_name)
+        return file_names
+
+    def discover_catalog_files(self, refresh=False):
+        """Build an index of all metadata and waveform files available
+        on the RIT website, from the index pages of the metadata and
+        waveform data directories. These pages are only fetched once, and
+        the result is kept in `self.web_index`.
+
+        Args:
+            refresh (bool, optional): Re-read the index pages even if they
+                have been read before. Defaults to False.
+
+        Returns:
+            dict: with keys
+                - "metadata": simulation index -> names of metadata files
+                - "waveform_data": set of names of waveform data files
+        """
+        if self.web_index is not None and not refresh:
+            return self.web_index
+        metadata_files = collections.defaultdict(list)
+        for file_name in self.list_web_directory(self.metadata_url):
+            if not file_name.endswith("_Metadata.txt"):
+                continue
+            try:
+                idx, _, _ = self.sim_info_from_metadata_filename(file_name)
+            except Exception:
+                continue
+            metadata_files[idx].append(file_name)
+        waveform_files = set(
+            file_name
+            for file_name in self.list_web_directory(self.waveform_data_url)
+            if file_name.endswith(".h5")
+        )
+        if self.verbosity > 2:
+            print(
+                "...found {} metadata and {} waveform files listed on the web".format(
+                    sum([len(v) for v in metadata_files.values()]),
+                    len(waveform_files),
+                )
+            )
+        self.web_index = {
+            "metadata": dict(metadata_files),
+            "waveform_data": waveform_files,
+        }
+        return self.web_index
+
+    def metadata_filename_from_web_index(self, idx, possible_res, max_id_in_name):
+        """Name of the metadata file listed on the web for a simulation
+        index. If several are listed, the one a crawl would find first is
+        returned.
+
+        Returns:
+            str: name of the metadata file, or None if the index is not listed
+        """
+        if self.web_index is None:
+            return None
+        listed = self.web_index["metadata"].get(idx, [])
+        if len(listed) == 0:
+            return None
+        search_order = self.metadata_filenames_to_probe(
+            idx, possible_res, max_id_in_name
+        )
+        for file_name in search_order:
+            if file_name in listed:
+                return file_name
+        return sorted(listed)[0]
+
+    def metadata_filenames_to_probe(self, idx, possible_res, max_id_in_name):
+        """All metadata file names that could exist on the web for a given
+        simulation index, without repetitions and in the order in which a
+        serial crawl would try them.
+        """
+        file_names = []
+        for res in possible_res:
+            for id_val in range(max_id_in_name):
+                for file_name in self.metadata_filenames(idx, res, id_val):
+                    if file_name not in file_names:
+                        file_names.append(file_name)
+        return file_names
+
+    def _host_limit(self, link):
+        """Semaphore bounding the number of simultaneous requests that
+        the crawler makes to the host serving `link`"""
+        host = urllib.parse.urlparse(link).netloc
+        with self._host_limits_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(
+                    self.max_connections_per_host
+                )
+            return self._host_limits[host]
+
+    def probe_metadata_filename(self, idx, possible_res, max_id_in_name, executor):
+        """Look for the metadata file of a simulation on the web by checking
+        all candidate file names in parallel.
+
+        Candidates are submitted to `executor` together. As soon as one of
+        them is found, candidates that come later in the serial search order
+        are cancelled (or skipped, if they already started), so the file name
+        returned is the one a serial crawl would have found first. As in a
+        serial crawl, a file that is empty or cannot be parsed does not count
+        as found.
+
+        Args:
+            idx (int): simulation index
+            possible_res (list): resolutions to try
+            max_id_in_name (int): number of ID values to try
+            executor (concurrent.futures.Executor): pool to run probes in
+
+        Returns:
+            str: name of the metadata file found, or None
+        """
+        file_names = self.metadata_filenames_to_probe(idx, possible_res, max_id_in_name)
+        lock = threading.Lock()
+        first_hit = [len(file_names)]
+
+        def probe(position):
+            with lock:
+                if position > first_hit[0]:
+                    return False
+            file_path_web = self.metadata_url + "/" + file_names[position]
+            with self._host_limit(file_path_web):
+                found = self.metadata_link_is_valid(file_path_web)
+            if found:
+                with lock:
+                    first_hit[0] = min(first_hit[0], position)
+            elif self.verbosity > 3:
+                print("...tried and failed to find {}".format(file_path_web))
+            return found
+
+        futures = {
+            executor.submit(probe, position): position
+            for position in range(len(file_names))
+        }
+        for future in concurrent.futures.as_completed(futures):
+            if future.cancelled() or not future.result():
+                continue
+            for other, position in futures.items():
+                if position > futures[future]:
+                    other.cancel()
+        if first_hit[0] < len(file_names):
+            return file_names[first_hit[0]]
+        return None
+
+    def metadata_link_is_valid(self, link):
+        """Whether a metadata file exists on the web and holds metadata,
+        i.e. it is neither empty nor unparsable.
+
+        Args:
+            link (str): URL of the metadata file
+
+        Returns:
+            bool: True if metadata could be read from the file
+        """
+        try:
+            response = utils.http_session().get(link)
+            if response.status_code != requests.codes.ok:
+                return False
+            _, metadata_dict = self.parse_metadata_txt(
+                response.content.decode().split("\n")
+            )
+        except Exception:
+            return False
+        return len(metadata_dict) > 0
+
+    def fetch_metadata_from_web(self, file_name):
+        """Download a metadata file from the web into the metadata
+        directory, and read it.
+
+        Returns:
+            pandas.DataFrame: metadata of the simulation (empty if the file
+            is empty or could not be parsed)
+        """
+        file_path_web = self.metadata_url + "/" + file_name
+        if self.verbosity > 2:
+            print("...found {}".format(file_path_web))
+        with self._host_limit(file_path_web):
+            try:
+                _, metadata_dict = self.metadata_from_link(
+                    file_path_web, save_to=self.metadata_dir / file_name
+                )
+            except Exception:
+                metadata_dict = {}
+        if len(metadata_dict) == 0:
+            return pd.DataFrame({})
+        return self.metadata_df_from_dict(file_name, metadata_dict)
+
+    def crawl_index(self, idx, sims, possible_res, max_id_in_name, executor):
+        """Find metadata for one simulation index: first on disk, then in
+        the DataFrame `sims` read from a previous crawl, and finally on the web.
+
+        Returns:
+            pandas.DataFrame: metadata of the simulation (empty if not found)
+        """
+        possible_sim_tags = self.simtags(idx)
+        if self.verbosity > 3:
+            print("\nHunting for sim with idx: {}".format(idx))
+
+        # First, check if metadata present as file on disk
+        if self.use_cache:
+            if self.verbosity > 3:
+                print("checking for metadata file on disk")
+            sim_data = self.metadata_from_cache(idx)
+            if len(sim_data) > 0:
+                if self.verbosity > 3:
+                    print("...metadata found on disk for {}".format(idx))
+                return sim_data
+
+        # Second, check if metadata present already in DataFrame
+        if len(sims) > 0:
+            if self.verbosity > 1:
+                print("Checking existing dataframe")
+            for _, row in sims.iterrows():
+                name = row["simulation_name"]
+                for sim_tag in possible_sim_tags:
+                    if sim_tag in name:
+                        f_idx, res, id_val = self.sim_info_from_metadata_filename(name)
+                        assert f_idx == idx, (
+                            "Index found for sim from metadata is not",
+                            " the same as we were searching for ({} vs {}).".format(
+                                f_idx, idx
+                            ),
+                        )
+                        if self.verbosity > 3:
+                            print(
+                                "...metadata found in DF for {}, {}, {}".format(
+                                    idx, res, id_val
+                                )
+                            )
+                        return pd.DataFrame.from_dict(row.to_dict(), index=[0])
+
+        # If not already present, look it up in the listing of the web
+        # directory, and failing that fetch metadata the hard way
+        file_name = self.metadata_filename_from_web_index(
+            idx, possible_res, max_id_in_name
+        )
+        if file_name is not None:
+            sim_data = self.fetch_metadata_from_web(file_name)
+            if len(sim_data) > 0:
+                return sim_data
+            # The listed file is empty or unparsable: probe the other
+            # candidates, as a serial crawl would
+        file_name = self.probe_metadata_filename(
+            idx, possible_res, max_id_in_name, executor
+        )
+        if file_name is None:
+            if self.verbosity > 3:
+                print("...metadata for {} NOT FOUND.".format(possible_sim_tags))
+            return pd.DataFrame({})
+        return self.fetch_metadata_from_web(file_name)
+
     def fetch_metadata_for_catalog(
-        self, num_sims_to_crawl=2000, possible_res=[], max_id_in_name=-1
+        self,
+        num_sims_to_crawl=2000,
+        possible_res=[],
+        max_id_in_name=-1,
+        num_workers=8,
+        max_connections_per_host=16,
+        discover=True,
     ):
         """
         We crawl the webdirectory where RIT metadata usually lives,
-        and try to read metadata for as many simulations as we can
+        and try to read metadata for as many simulations as we can.
+
+        With `discover=True`, the index page of the web directory is read
+        once and the metadata files listed there are fetched directly.
+        Candidate file names are only probed for indices missing from
+        the listing.
+
+        Simulation indices are crawled `num_workers` at a time, and for
+        each index all candidate metadata file names are probed in
+        parallel, with at most `max_connections_per_host` requests in
+        flight to any one host. Results are collected in index order, so
+        the metadata table is the same as that of a serial crawl.
+
+        Each crawled index is committed to an append-only journal (see
+        `RITMetadataJournal`), so that an interrupted crawl resumes from
+        where it stopped. `metadata.csv` is written once, at the end.
         """
         if len(possible_res) == 0:
             possible_res = self.possible_res
         if max_id_in_name <= 0:
             max_id_in_name = self.max_id_val
-        import pandas as pd
+        self.max_connections_per_host = max_connections_per_host
 
         sims = pd.DataFrame({})
 
@@ -460,7 +801,7 @@ class RITCatalogHelper(object):
             ):
                 if self.verbosity > 2:
                     print("Opening file {}".format(metadata_df_fpath))
-                self.metadata = pd.read_csv(metadata_df_fpath)
+                self.read_metadata_df_from_disk()
                 if len(self.metadata) >= (num_sims_to_crawl - 1):
                     # return self.metadata
                     return self.metadata.iloc[: num_sims_to_crawl - 1]
@@ -469,86 +810,56 @@ class RITCatalogHelper(object):
         if self.verbosity > 2:
             print("Found metadata for {} sims".format(len(sims)))
 
-        for idx in tqdm(range(1, 1 + num_sims_to_crawl)):
-            found = False
-            possible_sim_tags = self.simtags(idx)
+        if discover:
+            self.discover_catalog_files()
 
-            if self.verbosity > 3:
-                print("\nHunting for sim with idx: {}".format(idx))
+        # Indices committed to the journal by a previous, interrupted crawl
+        # are not crawled again
+        records = {}
+        journal = None
+        if self.use_cache:
+            journal = RITMetadataJournal(self.metadata_dir / "metadata_journal.jsonl")
+            records = {
+                idx: record
+                for idx, record in journal.read().items()
+                if idx <= num_sims_to_crawl
+            }
+            if self.verbosity > 2 and len(records) > 0:
+                print("Resuming crawl after {} indices".format(len(records)))
+        indices_to_crawl = [
+            idx for idx in range(1, 1 + num_sims_to_crawl) if idx not in records
+        ]
 
-            # First, check if metadata present as file on disk
-            if not found and self.use_cache:
-                if self.verbosity > 3:
-                    print("checking for metadata file on disk")
-                sim_data = self.metadata_from_cache(idx)
+        previous_sims = sims
+        with ThreadPoolExecutor(
+            max_workers=max_connections_per_host
+        ) as probe_executor, ThreadPoolExecutor(max_workers=num_workers) as executor:
+            crawled = executor.map(
+                lambda idx: (
+                    idx,
+                    self.crawl_index(
+                        idx, previous_sims, possible_res, max_id_in_name, probe_executor
+                    ),
+                ),
+                indices_to_crawl,
+            )
+            for idx, sim_data in tqdm(crawled, total=len(indices_to_crawl)):
+                record = None
                 if len(sim_data) > 0:
-                    found = True
-                    if self.verbosity > 3:
-                        print("...metadata found on disk for {}".format(idx))
-
-            # Second, check if metadata present already in DataFrame
-            if len(sims) > 0 and not found:
-                if self.verbosity > 1:
-                    print("Checking existing dataframe")
-                for _, row in sims.iterrows():
-                    name = row["simulation_name"]
-                    for sim_tag in possible_sim_tags:
-                        if sim_tag in name:
-                            found = True
-                            f_idx, res, id_val = self.sim_info_from_metadata_filename(
-                                name
-                            )
-                            assert f_idx == idx, (
-                                "Index found for sim from metadata is not",
-                                " the same as we were searching for ({} vs {}).".format(
-                                    f_idx, idx
-                                ),
-                            )
-                            if self.verbosity > 3:
-                                print(
-                                    "...metadata found in DF for {}, {}, {}".format(
-                                        idx, res, id_val
-                                    )
-                                )
-                            sim_data = pd.DataFrame.from_dict(row.to_dict(), index=[0])
-                            break
-
-            # If not already present, fetch metadata the hard way
-            if not found:
-                for res in possible_res:
-                    for id_val in range(max_id_in_name):
-                        # If not already present, fetch metadata
-                        sim_data = self.fetch_metadata(idx, res, id_val)
-                        if len(sim_data) > 0:
-                            found = True
-                            if self.verbosity > 3:
-                                print(
-                                    "...metadata txt file found for {}, {}, {}".format(
-                                        idx, res, id_val
-                                    )
-                                )
-                            break
-                        else:
-                            if self.verbosity > 3:
-                                print(
-                                    "...metadata not found for {}, {}, {}".format(
-                                        idx, res, id_val
-                                    )
-                                )
-                    # just need to find one resolution, so exit loop if its been found
-                    if found:
-                        break
-            if found:
-                sims = pd.concat([sims, sim_data])
-            else:
-                if self.verbosity > 3:
-                    print("...metadata for {} NOT FOUND.".format(possible_sim_tags))
-
-            self.metadata = sims
-            if self.use_cache:
-                self.write_metadata_df_to_disk()
+                    record = RITMetadataJournal.record_from_df(sim_data)
+                records[idx] = record
+                if journal is not None:
+                    journal.append(idx, record)
+
+        # Materialize the metadata table once, in index order
+        self.metadata = pd.DataFrame.from_records(
+            [records[idx] for idx in sorted(records) if records[idx] is not None]
+        )
+        if self.use_cache:
+            self.write_metadata_df_to_disk()
+            journal.remove()
 
-        self.num_of_sims = len(sims)
+        self.num_of_sims = len(self.metadata)
         return self.metadata
 
     def write_metadata_df_to_disk(self):
@@ -578,7 +889,10 @@ class RITCatalogHelper(object):
     def read_metadata_df_from_disk(self):
         metadata_df_fpath = self.metadata_dir / "metadata.csv"
         if os.path.exists(metadata_df_fpath) and os.path.getsize(metadata_df_fpath) > 0:
-            self.metadata = pd.read_csv(metadata_df_fpath)
+            self.metadata = cache.read_dataframe_cache(metadata_df_fpath)
+            if self.metadata is None:
+                self.metadata = pd.read_csv(metadata_df_fpath)
+                cache.write_dataframe_cache(self.metadata, metadata_df_fpath)
         else:
             self.metadata = pd.DataFrame([])
         return self.metadata
@@ -588,6 +902,9 @@ class RITCatalogHelper(object):
         Possible file formats:
         (1) https://ccrgpages.rit.edu/~RITCatalog/Data/ExtrapStrain_RIT-BBH-0193-n100.h5
         (2) https://ccrgpages.rit.edu/~RITCatalog/Data/ExtrapStrain_RIT-eBBH-1911-n100.h5
+
+        The file is fetched with a single GET request, which also tells
+        whether it exists on the web.
         """
         if use_cache is None:
             use_cache = self.use_cache
@@ -607,21 +924,10 @@ class RITCatalogHelper(object):
         else:
             if self.verbosity > 2:
                 print("...writing to cache: {}".format(str(local_file_path)))
-            if utils.url_exists(file_path_web):
-                if self.verbosity > 2:
-                    print("...downloading {}".format(file_path_web))
-                # wget.download(str(file_path_web), str(local_file_path))
-
-                subprocess.call(
-                    [
-                        "wget",
-                        "--no-check-certificate",
-                        str(file_path_web),
-                        "-O",
-                        str(local_file_path),
-                    ]
-                )
-            else:
+            if self.verbosity > 2:
+                print("...downloading {}".format(file_path_web))
+            utils.download_file(file_path_web, local_file_path, if_newer=False)
+            if not os.path.exists(local_file_path):
                 if self.verbosity > 2:
                     print(
                         "... ... but couldnt find link: {}".format(str(file_path_web))
@@ -631,11 +937,20 @@ class RITCatalogHelper(object):
         raise NotImplementedError()
 
     def download_waveform_data_for_catalog(
-        self, num_sims_to_crawl=100, possible_res=[], max_id_in_name=-1, use_cache=None
+        self,
+        num_sims_to_crawl=100,
+        possible_res=[],
+        max_id_in_name=-1,
+        use_cache=None,
+        discover=True,
     ):
         """
         We crawl the webdirectory where RIT waveform data usually lives,
-        and try to read waveform data for as many simulations as we can
+        and try to read waveform data for as many simulations as we can.
+
+        With `discover=True`, the index page of the web directory is read
+        first, and files that are not listed there are not requested at all.
+        If the index page cannot be read, every file is requested.
         """
         if len(possible_res) == 0:
             possible_res = self.possible_res
@@ -661,12 +976,81 @@ class RITCatalogHelper(object):
             metadata = self.read_metadata_df_from_disk()
         sims = {}
 
+        listed_files = set()
+        if discover:
+            listed_files = self.discover_catalog_files()["waveform_data"]
+
         for idx, sim_name in tqdm(enumerate(metadata["simulation_name"])):
             if idx + 1 > num_sims_to_crawl:
                 break
             file_name = self.waveform_filename_from_simname(sim_name)
             local_file_path = self.waveform_data_dir / file_name
-            self.download_waveform_data(sim_name, use_cache=use_cache)
+            if len(listed_files) > 0 and file_name not in listed_files:
+                if self.verbosity > 2:
+                    print("...{} is not listed on the web".format(file_name))
+            else:
+                self.download_waveform_data(sim_name, use_cache=use_cache)
             sims[sim_name] = local_file_path
 
         return sims
+
+
+class RITMetadataJournal(object):
+    """Append-only journal of the metadata found by a RIT metadata crawl.
+
+    Each crawled simulation index is committed as one JSON line, holding
+    the metadata of the simulation found (or null if none was found), so
+    that recording an index costs a single small write. An interrupted
+    crawl can resume from the indices committed to the journal, and the
+    metadata table is only built once the crawl is complete.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    @staticmethod
+    def record_from_df(sim_data):
+        """Metadata of one simulation, from a single-row DataFrame, as a
+        JSON-serializable dict"""
+        record = {}
+        for key, value in sim_data.iloc[0].to_dict().items():
+            if "Unnamed" in str(key):
+                continue
+            if hasattr(value, "item"):
+                value = value.item()
+            elif not isinstance(value, (str, int, float, bool, type(None))):
+                value = str(value)
+            record[key] = value
+        return record
+
+    def append(self, idx, record):
+        """Commit the metadata (or None) found for simulation index `idx`"""
+        with open(self.file_path, "a") as f:
+            f.write(json.dumps({"idx": idx, "metadata": record}) + "\n")
+            f.flush()
+
+    def read(self):
+        """Read all committed records
+
+        Returns:
+            dict: simulation index -> metadata dict, or None if no
+                simulation was found for that index
+        """
+        records = {}
+        if not os.path.exists(self.file_path):
+            return records
+        with open(self.file_path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Partially written line from an interrupted crawl
+                    continue
+                records[entry["idx"]] = entry["metadata"]
+        return records
+
+    def remove(self):
+        try:
+            os.remove(self.file_path)
+        except FileNotFoundError:
+            pass
@@ -1,24 +1,78 @@
+import collections
 import os
+import re
 
 import sxs
-from nrcatalogtools import catalog, waveform
+from sxs.utilities import select_by_path_component
+
+from nrcatalogtools import cache, catalog, waveform
+
+
+# Patterns selecting the files of a simulation from the catalog,
+# as passed to `sxs.Catalog.select_files`
+path_patterns = {
+    "waveform": "{}/Lev/rhOverM",
+    "metadata": "{}/Lev/metadata.json",
+}
+
+_version_suffix = re.compile(r"v[0-9]+$")
 
 
 class SXSCatalog(catalog.CatalogBase):
     def __init__(self, catalog=None, verbosity=0, **kwargs) -> None:
         super().__init__(catalog, **kwargs)
         self._verbosity = verbosity
+        self.path_index_file = sxs.sxs_directory("cache") / "nrcatalogtools_paths.json"
+        self._path_index = None
         self._add_paths_to_metadata()
 
-    def waveform_filename_from_simname(self, sim_name):
-        return os.path.basename(self.waveform_filepath_from_simname(sim_name))
+    @property
+    def path_index(self):
+        """Map of simulation names to the paths (relative to the sxs
+        cache) of their waveform and metadata files, as `select_files`
+        resolves them. Read from `path_index_file`, or built and written
+        there if the catalog changed since it was written."""
+        if self._path_index is None:
+            key = {
+                "modified": self._dict.get("modified"),
+                "num_simulations": len(self.simulations),
+                "num_files": len(self.files),
+            }
+            path_index = cache.read_json_cache(self.path_index_file, key)
+            if path_index is None:
+                path_index = self._build_path_index()
+                cache.write_json_cache(self.path_index_file, key, path_index)
+            self._path_index = path_index
+        return self._path_index
 
-    def waveform_filepath_from_simname(self, sim_name):
-        poss_files = self.select_files(f"{sim_name}/Lev/rhOverM")
-        file_path = (
-            sxs.sxs_directory("cache")
-            / poss_files[list(poss_files.keys())[0]]["truepath"]
-        )
+    def _build_path_index(self):
+        # Group the catalog files by simulation in one pass, so that each
+        # simulation only searches its own files instead of the whole catalog
+        files = self.files
+        files_by_sim = collections.defaultdict(list)
+        for path in files:
+            files_by_sim[_version_suffix.sub("", path.split("/", 1)[0])].append(path)
+
+        path_index = {}
+        for sim_name in self.simulations:
+            sim_paths = {}
+            for file_type, pattern in path_patterns.items():
+                selection = sorted(
+                    select_by_path_component(
+                        pattern.format(sim_name), files_by_sim.get(sim_name, [])
+                    )
+                )
+                if selection:
+                    sim_paths[file_type] = files[selection[0]]["truepath"]
+            path_index[sim_name] = sim_paths
+        return path_index
+
+    def _filepath_from_simname(self, sim_name, file_type):
+        truepath = self.path_index.get(sim_name, {}).get(file_type)
+        if truepath is None:
+            poss_files = self.select_files(path_patterns[file_type].format(sim_name))
+            truepath = poss_files[list(poss_files.keys())[0]]["truepath"]
+        file_path = sxs.sxs_directory("cache") / truepath
         if not os.path.exists(file_path):
             if self._verbosity > 2:
                 print(
@@ -27,24 +81,41 @@ class SXSCatalog(catalog.CatalogBase):
                 )
         return file_path.as_posix()
 
+    def waveform_filename_from_simname(self, sim_name):
+        return os.path.basename(self.waveform_filepath_from_simname(sim_name))
+
+    def waveform_filepath_from_simname(self, sim_name):
+        return self._filepath_from_simname(sim_name, "waveform")
+
     def metadata_filename_from_simname(self, sim_name):
         return os.path.basename(self.metadata_filepath_from_simname(sim_name))
 
     def metadata_filepath_from_simname(self, sim_name):
-        poss_files = self.select_files(f"{sim_name}/Lev/metadata.json")
-        file_path = (
-            sxs.sxs_directory("cache")
-            / poss_files[list(poss_files.keys())[0]]["truepath"]
-        )
-        if not os.path.exists(file_path):
-            if self._verbosity > 2:
-                print(
-                    f"WARNING: Could not resolve path for {sim_name}"
-                    f"..best calculated path = {file_path}"
+        return self._filepath_from_simname(sim_name, "metadata")
+
+    def download_targets(self, sim_name):
+        """Waveform and metadata files of a simulation, including the
+        .h5/.json companion of each, with their sizes and checksums"""
+        files = self.files
+        targets = []
+        for truepath in self.path_index.get(sim_name, {}).values():
+            stem, _ = os.path.splitext(truepath)
+            for path in dict.fromkeys([truepath, stem + ".h5", stem + ".json"]):
+                if path not in files:
+                    continue
+                file_info = files[path]
+                targets.append(
+                    (
+                        file_info["download"],
+                        (sxs.sxs_directory("cache") / file_info["truepath"]).as_posix(),
+                        file_info["filesize"],
+                        file_info["checksum"],
+                    )
                 )
-        return file_path.as_posix()
+        return targets
 
     def get(self, sim_name, extrapolation_order=2, download=None):
+        sim_name = self.resolve_simulation_name(sim_name)
         extrap_key = f"Extrapolated_N{extrapolation_order}.dir"
 
         # Download only if not available
@@ -78,26 +149,12 @@ class SXSCatalog(catalog.CatalogBase):
         raise NotImplementedError("This shouldn't be called.")
 
     def _add_paths_to_metadata(self):
-        metadata_dict = self._dict["simulations"]
-        existing_cols = list(metadata_dict[list(metadata_dict.keys())[0]].keys())
-        new_cols = [
-            "metadata_link",
-            "metadata_location",
-            "waveform_data_link",
-            "waveform_data_location",
-        ]
-
-        if any([col not in existing_cols for col in new_cols]):
-            for sim_name in metadata_dict:
-                if "metadata_location" not in existing_cols:
-                    metadata_dict[sim_name][
-                        "metadata_location"
-                    ] = self.metadata_filepath_from_simname(sim_name)
-                if "metadata_link" not in existing_cols:
-                    metadata_dict[sim_name]["metadata_link"] = ""
-                if "waveform_data_link" not in existing_cols:
-                    metadata_dict[sim_name]["waveform_data_link"] = ""
-                if "waveform_data_location" not in existing_cols:
-                    metadata_dict[sim_name][
-                        "waveform_data_location"
-                    ] = self.waveform_filepath_from_simname(sim_name)
+        simulations = self._dict["simulations"]
+        simulations.add_derived_column(
+            "metadata_location", self.metadata_filepath_from_simname
+        )
+        simulations.add_derived_column("metadata_link", lambda sim_name: "")
+        simulations.add_derived_column("waveform_data_link", lambda sim_name: "")
+        simulations.add_derived_column(
+            "waveform_data_location", self.waveform_filepath_from_simname
+        )
@@ -1,12 +1,17 @@
 import functools
+import hashlib
 import os
 import pathlib
 import shutil
+import threading
+from datetime import datetime, timezone
 
 import lal
+import numpy as np
 import requests
-
-import sxs
+from requests.adapters import HTTPAdapter
+from tqdm.auto import tqdm
+from urllib3.util.retry import Retry
 
 if os.getenv("NR_CATALOG_CACHE"):
     nrcatalog_cache_dir = (
@@ -47,9 +52,84 @@ maya_catalog_info["data_dir"] = maya_catalog_info["cache_dir"] / "data"
 maya_catalog_info["metadata_dir"] = maya_catalog_info["cache_dir"] / "metadata"
 maya_catalog_info["data_url"] = maya_catalog_info["url"]
 
+# Cache of waveform modes resampled onto uniform time grids
+waveform_cache_info = {
+    "cache_dir": nrcatalog_cache_dir / "waveform_modes",
+    "max_bytes": 4 * 1024**3,
+}
+
+
+# Retry policy and connection pool size of the shared HTTP session
+http_retries = 5
+http_backoff_factor = 0.5
+http_pool_size = 32
 
-def url_exists(link, num_retries=100):
-    """Check if a given URL exists on the web.
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def make_http_session(
+    retries=http_retries, backoff_factor=http_backoff_factor, pool_size=http_pool_size
+):
+    """Create an HTTP session that keeps connections alive and retries
+    failed requests.
+
+    Args:
+        retries (int): maximum number of retries of a request, after
+            connection errors or transient server errors (429, 5xx)
+        backoff_factor (float): retries wait `backoff_factor * 2**n`
+            seconds after the n-th consecutive failure
+        pool_size (int): number of connections kept alive per host, i.e.
+            the number of threads that can use the session concurrently
+            without opening new connections
+
+    Returns:
+        requests.Session: the session
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["HEAD", "GET"],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.verify = False
+    return session
+
+
+def http_session():
+    """The HTTP session shared by all requests made by this package"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            requests.packages.urllib3.disable_warnings()
+            _http_session = make_http_session()
+        return _http_session
+
+
+def configure_http_session(
+    retries=http_retries, backoff_factor=http_backoff_factor, pool_size=http_pool_size
+):
+    """Replace the shared HTTP session with one using the given retry
+    policy and pool size. See `make_http_session` for the arguments."""
+    global _http_session
+    requests.packages.urllib3.disable_warnings()
+    session = make_http_session(
+        retries=retries, backoff_factor=backoff_factor, pool_size=pool_size
+    )
+    with _http_session_lock:
+        _http_session = session
+
+
+def url_exists(link):
+    """Check if a given URL exists on the web. Retries follow the policy
+    of the shared HTTP session, see `configure_http_session` to change it.
 
     Args:
         link : complete web URL
@@ -57,47 +137,181 @@ def url_exists(link, num_retries=100):
     Returns:
         bool: True/False whether the URL could be found on WWW.
     """
-    requests.packages.urllib3.disable_warnings()
-    for n in range(num_retries):
-        try:
-            response = requests.head(link, verify=False)
-            if response.status_code == requests.codes.ok:
-                return True
-            else:
-                return False
-        except Exception:
-            continue
-    return False
+    try:
+        response = http_session().head(link)
+    except Exception:
+        return False
+    return response.status_code == requests.codes.ok
+
+
+def _local_file_is_newer(response, local_path, if_newer):
+    """Whether the file served in `response` is older than the local one,
+    following the `if_newer` argument of `download_file`"""
+    if not if_newer or "Last-Modified" not in response.headers:
+        return False
+    remote_timestamp = datetime.strptime(
+        response.headers["Last-Modified"], "%a, %d %b %Y %H:%M:%S GMT"
+    ).replace(tzinfo=timezone.utc)
+    if isinstance(if_newer, datetime):
+        local_timestamp = if_newer
+    elif isinstance(if_newer, pathlib.Path) and if_newer.exists():
+        local_timestamp = datetime.fromtimestamp(if_newer.stat().st_mtime, timezone.utc)
+    elif local_path.exists():
+        local_timestamp = datetime.fromtimestamp(
+            local_path.stat().st_mtime, timezone.utc
+        )
+    else:
+        return False
+    return local_timestamp > remote_timestamp
 
 
 def download_file(url, path, progress=False, if_newer=True):
-    if url_exists(url):
+    """Download a file, with a single GET request through the shared
+    HTTP session.
+
+    Args:
+        url (str): URL of the file
+        path (str or Path): where to save the file
+        progress (bool, optional): show a progress bar. Defaults to False.
+        if_newer (bool, datetime or Path, optional): only download the
+            file if it is newer than the local file (or the given time, or
+            the given file). Same as for `sxs.utilities.download_file`.
+
+    Returns:
+        pathlib.Path: `path`, which is left untouched if the URL cannot be
+            found, or `if_newer` if that is a file newer than the URL.
+    """
+    path = pathlib.Path(path).expanduser().resolve()
+    with http_session().get(url, stream=True, allow_redirects=True) as r:
+        if r.status_code != requests.codes.ok:
+            return path
+        if _local_file_is_newer(r, path, if_newer):
+            if progress:
+                print(f"Skipping download from '{url}' because local file is newer")
+            if isinstance(if_newer, pathlib.Path) and if_newer.exists():
+                return if_newer
+            return path
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = path.with_name(path.name + ".part")
+        file_size = int(r.headers.get("Content-Length", 0))
+        r.raw.read = functools.partial(r.raw.read, decode_content=True)
         try:
-            return sxs.utilities.downloads.download_file(
-                url, path, progress=progress, if_newer=if_newer
-            )
-        except Exception:
-            requests.packages.urllib3.disable_warnings()
-            for n in range(100):
-                try:
-                    r = requests.get(
-                        url, verify=False, stream=True, allow_redirects=True
-                    )
+            with part_path.open("wb") as f:
+                if progress and file_size:
+                    with tqdm.wrapattr(
+                        r.raw, "read", total=file_size, dynamic_ncols=True
+                    ) as r_raw:
+                        shutil.copyfileobj(r_raw, f)
+                else:
+                    shutil.copyfileobj(r.raw, f)
+            part_path.replace(path)
+        finally:
+            try:
+                part_path.unlink()
+            except FileNotFoundError:
+                pass
+    return path
+
+
+def _total_size_from_response(response):
+    """Full size of the file served, from the headers of a (partial)
+    response, or None if unknown"""
+    if "Content-Encoding" in response.headers:
+        return None
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[-1]
+        return int(total) if total.isdigit() else None
+    if response.status_code == 200 and "Content-Length" in response.headers:
+        return int(response.headers["Content-Length"])
+    return None
+
+
+def md5_checksum(path, chunk_size=1 << 20):
+    """MD5 checksum of a file, as a hex string"""
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(functools.partial(f.read, chunk_size), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def download_file_resumable(
+    url, path, filesize=None, checksum=None, chunk_size=1 << 20
+):
+    """Download a file, resuming any earlier partial download of it.
+
+    The data is written to `<path>.part`, which is only renamed to `path`
+    once the download is complete and verified. If `<path>.part` already
+    exists, e.g. left behind by an interrupted download, only the rest of
+    the file is requested (with an HTTP Range request).
+
+    Args:
+        url (str): URL of the file
+        path (str or Path): where to save the file
+        filesize (int, optional): expected size of the file in bytes.
+            Defaults to the size reported by the server, if any.
+        checksum (str, optional): expected MD5 checksum of the file.
+            Defaults to None, i.e. no checksum verification.
+        chunk_size (int, optional): size of the chunks written to disk
+
+    Returns:
+        pathlib.Path: path of the downloaded file
+
+    Raises:
+        requests.HTTPError: if the server responds with an error
+        IOError: if the transfer ended early (the partial file is kept
+            to resume from), or if the downloaded file does not have the
+            expected size or checksum (the partial file is removed).
+    """
+    path = pathlib.Path(path).expanduser().resolve()
+    part_path = path.with_name(path.name + ".part")
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    for attempt in range(2):
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        if filesize is not None and offset > filesize:
+            offset = 0
+        headers = {"Range": f"bytes={offset}-"} if offset > 0 else {}
+        with http_session().get(
+            url, headers=headers, stream=True, allow_redirects=True
+        ) as response:
+            total = _total_size_from_response(response)
+            if response.status_code == 416:
+                # There is nothing past `offset`, so either the partial
+                # file is complete, or it is not a part of this file
+                if total == offset:
                     break
-                except Exception:
-                    continue
-            if r.status_code != 200:
-                print(f"An error occurred when trying to access <{url}>.")
-                try:
-                    print(r.json())
-                except Exception:
-                    pass
-                r.raise_for_status()
-                raise RuntimeError()  # Will only happen if the response was not strictly an error
-            r.raw.read = functools.partial(r.raw.read, decode_content=True)
-            path = pathlib.Path(path).expanduser().resolve()
-            with path.open("wb") as f:
-                shutil.copyfileobj(r.raw, f)
+                part_path.unlink()
+                continue
+            response.raise_for_status()
+            # The server may ignore the Range request and send everything
+            mode = "ab" if response.status_code == 206 else "wb"
+            with part_path.open(mode) as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+        break
+    else:
+        raise IOError(f"Could not download <{url}>")
+
+    if filesize is None:
+        filesize = total
+    size = part_path.stat().st_size
+    if filesize is not None and size < filesize:
+        raise IOError(
+            f"Download of <{url}> stopped after {size} of {filesize} bytes;"
+            f" it will resume from {part_path}"
+        )
+    if filesize is not None and size != filesize:
+        part_path.unlink()
+        raise IOError(
+            f"Downloaded {size} bytes from <{url}> instead of {filesize} bytes"
+        )
+    if checksum is not None and md5_checksum(part_path) != checksum:
+        part_path.unlink()
+        raise IOError(f"Checksum of the file downloaded from <{url}> does not match")
+    os.replace(part_path, path)
     return path
 
 
@@ -164,3 +378,30 @@ def amp_to_physical(M, D):
     """
 
     return lal.G_SI * M * lal.MSUN_SI / (lal.C_SI**2 * D * 1e6 * lal.PC_SI)
+
+
+def estimate_time_step(time, rtol=1e-9):
+    """Time step of a series of increasing time samples, in O(n).
+
+    For uniformly sampled times (whose steps differ by no more than `rtol`
+    times the step), this is the average step. Otherwise, it is the
+    median step.
+
+    parameters
+    ----------
+    time: array of time samples
+    rtol: relative tolerance on the variation of the step for the samples
+        to count as uniform
+
+    Returns
+    -------
+    Time step
+    """
+    time = np.asarray(time)
+    if len(time) < 2:
+        raise ValueError("At least two time samples are needed for a time step")
+    step = (time[-1] - time[0]) / (len(time) - 1)
+    diffs = np.diff(time)
+    if np.ptp(diffs) <= rtol * abs(step):
+        return step
+    return np.median(diffs)
@@ -1,4 +1,6 @@
+import collections
 import os
+import re
 
 import h5py
 import lal
@@ -6,14 +8,15 @@ import numpy as np
 from pycbc.pnutils import mtotal_eta_to_mass1_mass2
 from pycbc.types import TimeSeries
 from pycbc.waveform import frequency_from_polarizations
-from scipy.interpolate import InterpolatedUnivariateSpline
-from scipy.stats import mode as stat_mode
+from scipy.interpolate import InterpolatedUnivariateSpline, make_interp_spline
 
-from nrcatalogtools import utils
+from nrcatalogtools import cache, utils
 from nrcatalogtools.lvc import (
     check_interp_req,
-    get_nr_to_lal_rotation_angles,
+    get_nr_to_lal_frame,
     get_ref_vals,
+    get_rotation_angles_from_lal_frame,
+    get_rotation_angles_from_lal_frame_array,
 )
 
 from sxs import TimeSeries as sxs_TimeSeries
@@ -25,6 +28,243 @@ from sxs.waveforms.nrar import (
 )
 
 
+# Range of ell values of the modes read from RIT/MAYA format files
+ELL_MIN, ELL_MAX = 2, 10
+
+_mode_group_regex = re.compile(r"^(amp|phase)_l(\d+)_m(-?\d+)$")
+
+
+def map_dataset(dataset):
+    """Map the data of an HDF5 dataset from its file into memory, without
+    reading it, if it is stored contiguously and uncompressed.
+
+    Args:
+        dataset (h5py.Dataset): dataset of a file opened from disk
+
+    Returns:
+        numpy.memmap: read-only view of the data in the file, or None if the
+            dataset cannot be mapped (e.g. it is chunked or compressed)
+    """
+    if (
+        dataset.chunks is not None
+        or dataset.external is not None
+        or dataset.file.driver not in ("sec2", "stdio")
+        or dataset.dtype.kind not in "biufc"
+        or dataset.size == 0
+    ):
+        return None
+    offset = dataset.id.get_offset()
+    if offset is None:
+        return None
+    return np.memmap(
+        dataset.file.filename,
+        dtype=dataset.dtype,
+        mode="r",
+        offset=offset,
+        shape=dataset.shape,
+    )
+
+
+def read_modes_from_h5(h5_file, modes=None, ell_max=None, read_values=True, mmap=False):
+    """Read the amplitude and phase of SWSH modes from an HDF5 file in
+    the RIT/MAYA format, which has the groups `amp_l{ell}_m{em}` and
+    `phase_l{ell}_m{em}` with datasets `X` (time) and `Y` (values).
+
+    The groups of the file are listed once, rather than looking up every
+    possible mode, and each dataset is read once. Modes whose time samples
+    are identical share a single time array.
+
+    Args:
+        h5_file (h5py.File): open HDF5 file
+        modes (list of (int, int), optional): (ell, em) of the modes to
+            read. Defaults to all modes in the file.
+        ell_max (int, optional): only read modes with ell up to this.
+            Defaults to `ELL_MAX`.
+        read_values (bool, optional): read the amplitude and phase values
+            as well as their times. Defaults to True.
+        mmap (bool, optional): map datasets stored contiguously and
+            uncompressed into memory instead of reading them (see
+            `map_dataset`). Other datasets are read. Defaults to False.
+
+    Returns:
+        dict: (ell, em) -> [amp_time, amp, phase_time, phase], ordered by
+            ell and then em. amp and phase are None if `read_values` is
+            False.
+    """
+    if ell_max is None:
+        ell_max = ELL_MAX
+    if modes is not None:
+        modes = set(tuple(mode) for mode in modes)
+
+    groups = collections.defaultdict(dict)
+    for name in h5_file:
+        match = _mode_group_regex.match(name)
+        if match is None:
+            continue
+        kind, ell, em = match.group(1), int(match.group(2)), int(match.group(3))
+        groups[(ell, em)][kind] = name
+    selected = sorted(
+        (ell, em)
+        for (ell, em), names in groups.items()
+        if len(names) == 2
+        and ELL_MIN <= ell <= ell_max
+        and abs(em) <= ell
+        and (modes is None or (ell, em) in modes)
+    )
+
+    # Read every dataset once, and share time arrays between modes sampled
+    # at the same times (whether or not the datasets are hard links to the
+    # same data in the file)
+    arrays, time_axes = {}, collections.defaultdict(list)
+
+    def read(path, is_time):
+        if not (is_time or read_values):
+            return None
+        dataset = h5_file[path]
+        if dataset.id in arrays:
+            return arrays[dataset.id]
+        array = map_dataset(dataset) if mmap else None
+        if array is None:
+            array = dataset[()]
+        if is_time and len(array) > 0:
+            # Only compare the time arrays that could be equal in full
+            candidates = time_axes[(len(array), array[0], array[-1])]
+            for time_axis in candidates:
+                if np.array_equal(time_axis, array):
+                    array = time_axis
+                    break
+            else:
+                candidates.append(array)
+        arrays[dataset.id] = array
+        return array
+
+    mode_data = {}
+    for mode in selected:
+        amp_name, phase_name = groups[mode]["amp"], groups[mode]["phase"]
+        mode_data[mode] = [
+            read(f"{amp_name}/X", True),
+            read(f"{amp_name}/Y", False),
+            read(f"{phase_name}/X", True),
+            read(f"{phase_name}/Y", False),
+        ]
+    return mode_data
+
+
+def _mode_column(ell, em, ell_min):
+    """Index of the (ell, em) mode in the data of WaveformModes"""
+    return ell * (ell + 1) - ell_min**2 + em
+
+
+def _resample_modes(mode_data, times, data, ell_min):
+    """Resample the amplitude and phase of modes onto `times`, and write
+    the complex modes into their columns of `data`.
+
+    Amplitudes and phases sampled at the same times (sharing a time array,
+    see `read_modes_from_h5`) are interpolated together, with one spline
+    fit and evaluation over all of them. The others are interpolated one
+    at a time.
+
+    Args:
+        mode_data (dict): (ell, em) -> [amp_time, amp, phase_time, phase],
+            as returned by `read_modes_from_h5`
+        times (numpy.ndarray): times to resample the modes at
+        data (numpy.ndarray): array of shape (len(times), number of modes)
+        ell_min (int): smallest ell of the modes in `data`
+    """
+    # Group the amplitude and phase time series by their time arrays
+    series = collections.defaultdict(list)
+    for mode, (amp_time, amp, phase_time, phase) in mode_data.items():
+        series[id(amp_time)].append((amp_time, amp, mode, "amp"))
+        series[id(phase_time)].append((phase_time, phase, mode, "phase"))
+
+    resampled = collections.defaultdict(dict)
+    for group in series.values():
+        time = group[0][0]
+        if len(group) > 1 and len(time) > 3:
+            values = np.stack([values for _, values, _, _ in group], axis=-1)
+            spline = make_interp_spline(time, values, k=3, axis=0)
+            group_resampled = spline(times)
+            for idx, (_, _, mode, kind) in enumerate(group):
+                resampled[mode][kind] = group_resampled[:, idx]
+        else:
+            for _, values, mode, kind in group:
+                spline = InterpolatedUnivariateSpline(time, values)
+                resampled[mode][kind] = spline(times)
+
+    for (ell, em), mode_resampled in resampled.items():
+        data[:, _mode_column(ell, em, ell_min)] = mode_resampled["amp"] * np.exp(
+            1j * mode_resampled["phase"]
+        )
+
+
+def _read_and_resample(h5_file, ell_max=None, modes=None, lazy=False, mmap=False):
+    """Read modes from an HDF5 file in the RIT/MAYA format, and resample
+    them onto a uniform time grid covering the times of all modes.
+
+    Args:
+        h5_file (h5py.File): open HDF5 file
+        ell_max (int, optional): only consider modes with ell up to this.
+            Defaults to `ELL_MAX`.
+        modes (list of (int, int), optional): (ell, em) of the modes to
+            read. Defaults to all modes in the file.
+        lazy (bool, optional): only read the times of the modes, leaving
+            their data zero. Defaults to False.
+        mmap (bool, optional): map the datasets of the file into memory
+            where possible, see `read_modes_from_h5`. Defaults to False.
+
+    Returns:
+        tuple: times, data of the modes, smallest and largest ell of the
+            modes, and set of the modes not read
+    """
+    # The time grid is set by the times of all modes in the file, so
+    # that it does not depend on which modes are loaded
+    if modes is None and not lazy:
+        mode_data = read_modes_from_h5(h5_file, ell_max=ell_max, mmap=mmap)
+        mode_times = mode_data
+    else:
+        mode_times = read_modes_from_h5(
+            h5_file, ell_max=ell_max, read_values=False, mmap=mmap
+        )
+        if modes is not None:
+            modes = sorted(set(tuple(mode) for mode in modes))
+            missing = [mode for mode in modes if mode not in mode_times]
+            if missing:
+                raise RuntimeError(f"Modes {missing} not found in {h5_file.filename}")
+        mode_data = {}
+        if not lazy:
+            mode_data = read_modes_from_h5(h5_file, modes=modes, mmap=mmap)
+    if len(mode_times) == 0:
+        raise RuntimeError(
+            "We did not find even one mode in the file. Perhaps the "
+            "format `amp_l?_m?` and `phase_l?_m?` is not the "
+            "nomenclature of datagroups in the input file?"
+        )
+
+    LM = list(mode_times) if modes is None else modes
+    ell_min = min(ell for ell, _ in LM)
+    ell_max = max(ell for ell, _ in LM)
+    # get the minimum time and maximum time stamps for all modes,
+    # and the time step, once for every distinct time axis
+    t_min, t_max, dt = -1e99, 1e99, 1
+    time_steps = {}
+    for amp_time, _, phase_time, _ in mode_times.values():
+        for time in (amp_time, phase_time):
+            if id(time) not in time_steps:
+                time_steps[id(time)] = utils.estimate_time_step(time)
+            t_min = max(t_min, time[0])
+            t_max = min(t_max, time[-1])
+            dt = min(dt, time_steps[id(time)])
+
+    times = np.arange(t_min, t_max + 0.5 * dt, dt)
+    num_modes = (ell_max + 1) ** 2 - ell_min**2
+    if len(mode_data) == num_modes:
+        data = np.empty((len(times), num_modes), dtype=complex)
+    else:
+        data = np.zeros((len(times), num_modes), dtype=complex)
+    _resample_modes(mode_data, times, data, ell_min)
+    return times, data, ell_min, ell_max, set(LM) - set(mode_data)
+
+
 class WaveformModes(sxs_WaveformModes):
     def __new__(
         cls,
@@ -49,6 +289,14 @@ class WaveformModes(sxs_WaveformModes):
         )
         self._t_ref_nr = None
         self._filepath = None
+        self._pending_modes = set()
+        self._time_step = None
+        self._peak_time = None
+        self._peak_index = None
+        self._lal_frames = {}
+        self._nr_ref_phases = None
+        self._phases = {}
+        self._orbital_frequency = None
         self.verbosity = verbosity
         return self
 
@@ -78,7 +326,17 @@ class WaveformModes(sxs_WaveformModes):
         )
 
     @classmethod
-    def load_from_h5(cls, file_path_or_open_file, metadata={}, verbosity=0):
+    def load_from_h5(
+        cls,
+        file_path_or_open_file,
+        metadata={},
+        verbosity=0,
+        ell_max=None,
+        modes=None,
+        lazy=False,
+        use_cache=False,
+        mmap=False,
+    ):
         """Method to load SWSH waveform modes from RIT or MAYA catalogs
         from HDF5 file.
 
@@ -90,6 +348,23 @@ class WaveformModes(sxs_WaveformModes):
                 will be NR group specific)
             verbosity (int, optional): Verbosity level with which to
                 print messages during execution. Defaults to 0.
+            ell_max (int, optional): Only load modes with ell up to this.
+                Defaults to all modes in the file (up to `ELL_MAX`).
+            modes (list of (int, int), optional): (ell, em) of the modes
+                to load. The data of all other modes (between the smallest
+                and largest ell of these) is zero. Defaults to all modes.
+            lazy (bool, optional): Only read and resample the data of a
+                mode when it is first accessed through `get_mode_data`,
+                `get_mode` or the methods computing polarizations. Call
+                `load_modes` before using other methods of `sxs`.
+                Defaults to False.
+            use_cache (bool, optional): Memory-map the resampled modes from
+                the on-disk cache of `cache.read_array_cache` if they were
+                cached for the current state of the file, or cache them
+                otherwise. Not used with `lazy`. Defaults to False.
+            mmap (bool, optional): Map the amplitude and phase datasets of
+                the file into memory instead of copying them, where they
+                are stored contiguously and uncompressed. Defaults to False.
 
         Raises:
             RuntimeError: If inputs are invalid, or if no mode found in
@@ -120,49 +395,34 @@ class WaveformModes(sxs_WaveformModes):
         except AttributeError:
             cls._metadata = metadata
 
-        ELL_MIN, ELL_MAX = 2, 10
-        ell_min, ell_max = 99, -1
-        LM = []
-        t_min, t_max, dt = -1e99, 1e99, 1
-        mode_data = {}
-        for ell in range(ELL_MIN, ELL_MAX + 1):
-            for em in range(-ell, ell + 1):
-                afmt = f"amp_l{ell}_m{em}"
-                pfmt = f"phase_l{ell}_m{em}"
-                if afmt not in h5_file or pfmt not in h5_file:
-                    continue
-                amp_time = h5_file[afmt]["X"][:]
-                amp = h5_file[afmt]["Y"][:]
-                phase_time = h5_file[pfmt]["X"][:]
-                phase = h5_file[pfmt]["Y"][:]
-                mode_data[(ell, em)] = [amp_time, amp, phase_time, phase]
-                # get the minimum time and maximum time stamps for all modes
-                t_min = max(t_min, amp_time[0], phase_time[0])
-                t_max = min(t_max, amp_time[-1], phase_time[-1])
-                dt = min(
-                    dt,
-                    stat_mode(np.diff(amp_time), keepdims=True)[0][0],
-                    stat_mode(np.diff(phase_time), keepdims=True)[0][0],
+        filepath = h5_file.filename
+        cache_key = {"modes": modes, "ell_max": ell_max}
+        if modes is not None:
+            cache_key["modes"] = sorted(set(tuple(mode) for mode in modes))
+        cached = None
+        if use_cache and not lazy:
+            cached = cache.read_array_cache(filepath, cache_key)
+        if cached is not None:
+            if close_input_file:
+                h5_file.close()
+            times = np.array(cached["time"])
+            data = cached["data"]
+            ell_min, ell_max = (int(ell) for ell in cached["ells"])
+            pending_modes = set()
+        else:
+            try:
+                times, data, ell_min, ell_max, pending_modes = _read_and_resample(
+                    h5_file, ell_max=ell_max, modes=modes, lazy=lazy, mmap=mmap
+                )
+            finally:
+                if close_input_file:
+                    h5_file.close()
+            if use_cache and not lazy:
+                cache.write_array_cache(
+                    filepath,
+                    cache_key,
+                    {"time": times, "data": data, "ells": [ell_min, ell_max]},
                 )
-                ell_min = min(ell_min, ell)
-                ell_max = max(ell_max, ell)
-                LM.append([ell, em])
-        if close_input_file:
-            h5_file.close()
-        if len(LM) == 0:
-            raise RuntimeError(
-                "We did not find even one mode in the file. Perhaps the "
-                "format `amp_l?_m?` and `phase_l?_m?` is not the "
-                "nomenclature of datagroups in the input file?"
-            )
-
-        times = np.arange(t_min, t_max + 0.5 * dt, dt)
-        data = np.empty((len(times), len(LM)), dtype=complex)
-        for idx, (ell, em) in enumerate(LM):
-            amp_time, amp, phase_time, phase = mode_data[(ell, em)]
-            amp_interp = InterpolatedUnivariateSpline(amp_time, amp)
-            phase_interp = InterpolatedUnivariateSpline(phase_time, phase)
-            data[:, idx] = amp_interp(times) * np.exp(1j * phase_interp(times))
 
         w_attributes = {}
         w_attributes["metadata"] = metadata
@@ -180,7 +440,7 @@ class WaveformModes(sxs_WaveformModes):
         w_attributes["m_is_scaled_out"] = True
         # w_attributes["ells"] = ell_min, ell_max
 
-        return cls(
+        wfm = cls(
             data,
             time=times,
             time_axis=0,
@@ -190,6 +450,39 @@ class WaveformModes(sxs_WaveformModes):
             verbosity=verbosity,
             **w_attributes,
         )
+        wfm._filepath = filepath
+        wfm._pending_modes = pending_modes
+        return wfm
+
+    def load_modes(self, modes=None):
+        """Read and resample the data of modes that were not loaded yet,
+        for WaveformModes loaded with `lazy=True`.
+
+        Args:
+            modes (list of (int, int), optional): (ell, em) of the modes
+                to load. Defaults to all modes not loaded yet.
+        """
+        # Views and copies of lazily loaded WaveformModes do not share
+        # which modes are pending, so only the original loads them
+        pending = getattr(self, "_pending_modes", None)
+        if not pending:
+            return
+        if modes is None:
+            modes = pending
+        modes = [tuple(mode) for mode in modes if tuple(mode) in pending]
+        if not modes:
+            return
+        with h5py.File(self.filepath, "r") as h5_file:
+            mode_data = read_modes_from_h5(h5_file, modes=modes)
+        _resample_modes(mode_data, self.time, self.ndarray, self.ell_min)
+        pending.difference_update(modes)
+
+    @property
+    def time_step(self):
+        """Time step of the data, computed once"""
+        if getattr(self, "_time_step", None) is None:
+            self._time_step = utils.estimate_time_step(self.time)
+        return self._time_step
 
     @property
     def filepath(self):
@@ -273,6 +566,7 @@ class WaveformModes(sxs_WaveformModes):
         return parameters
 
     def get_mode_data(self, ell, em):
+        self.load_modes([(ell, em)])
         return self[f"Y_l{ell}_m{em}.dat"]
 
     def get_mode(
@@ -300,8 +594,10 @@ class WaveformModes(sxs_WaveformModes):
                 `sxs.TimeSeries(numpy.complex128)`:
                 Complex waveform mode time series
         """
+        from scipy.interpolate import CubicSpline
+
         if delta_t is None:
-            delta_t = stat_mode(np.diff(self.time), keepdims=True)[0][0]
+            delta_t = self.time_step
 
         # we assume that we generally do not sample at a rate below 128Hz.
         # Therefore, depending on the numerical value of dt, we deduce whether
@@ -313,40 +609,45 @@ class WaveformModes(sxs_WaveformModes):
             m_secs = utils.time_to_physical(total_mass)
             new_time = np.arange(min(self.time), max(self.time), delta_t / m_secs)
 
-        h = self.interpolate(new_time)
-
-        h_mode = h.get_mode_data(ell, em)
-        h_mode[:, 1:] *= utils.amp_to_physical(total_mass, distance)
-        h_mode[:, 0] *= m_secs
-
-        # Find peak of 22-mode
-        h_mode22 = h.get_mode_data(2, 2)
-        h_mode22[:, 0] *= m_secs
-
-        from scipy.interpolate import InterpolatedUnivariateSpline
-
-        x_axis = h_mode22[:, 0]
-        y_axis = (h_mode22[:, 1] ** 2 + h_mode22[:, 2] ** 2) ** 0.5
-
-        f = InterpolatedUnivariateSpline(x_axis, y_axis, k=4)
-        cr_pts = f.derivative().roots()
-        cr_pts = np.append(
-            cr_pts, (x_axis[0], x_axis[-1])
-        )  # also check the endpoints of the interval
-        cr_vals = f(cr_pts)
-        max_index = np.argmax(cr_vals)
+        # Only resample the requested mode, as `interpolate` would
+        self.load_modes([(ell, em)])
+        h_mode = CubicSpline(self.time, self.ndarray[:, self.index(ell, em)])(new_time)
+        h_mode *= utils.amp_to_physical(total_mass, distance)
 
-        epoch = h_mode[0, 0] - cr_pts[max_index]
+        # Align the peak of the 22-mode to t = 0
+        epoch = (new_time[0] - self.peak_time) * m_secs
 
-        retval = self.to_pycbc(
-            input_array=h_mode[:, 1] + 1j * h_mode[:, 2],
-            delta_t=delta_t,
-            epoch=epoch,
-        )
+        retval = self.to_pycbc(input_array=h_mode, delta_t=delta_t, epoch=epoch)
         if not to_pycbc:
             retval = sxs_TimeSeries(retval.data, time=retval.sample_times)
         return retval
 
+    @property
+    def peak_time(self):
+        """Time of the peak of the amplitude of the 22-mode (in units of
+        M), from a spline through the amplitude. Computed once."""
+        if getattr(self, "_peak_time", None) is None:
+            f = InterpolatedUnivariateSpline(self.time, self._get_amplitude_22(), k=4)
+            cr_pts = f.derivative().roots()
+            cr_pts = np.append(
+                cr_pts, (self.time[0], self.time[-1])
+            )  # also check the endpoints of the interval
+            self._peak_time = cr_pts[np.argmax(f(cr_pts))]
+        return self._peak_time
+
+    @property
+    def peak_index(self):
+        """Index of the sample with the largest amplitude of the 22-mode.
+        Computed once."""
+        if getattr(self, "_peak_index", None) is None:
+            self._peak_index = int(np.argmax(self._get_amplitude_22()))
+        return self._peak_index
+
+    def _get_amplitude_22(self):
+        """Get the amplitude of the 22-mode"""
+        self.load_modes([(2, 2)])
+        return np.abs(self.ndarray[:, self.index(2, 2)])
+
     @property
     def f_lower_at_1Msun(self):
         mode22 = self.get_mode_data(2, 2)
@@ -378,10 +679,62 @@ class WaveformModes(sxs_WaveformModes):
         # Get angles
         angles = self.get_angles(inclination, coa_phase, f_ref, t_ref, tol)
 
+        self.load_modes()
         polarizations = self.evaluate([angles["theta"], angles["psi"], angles["alpha"]])
 
         return polarizations
 
+    def get_polarizations_batch(
+        self, inclinations, coa_phases, f_ref=None, t_ref=None, tol=1e-6
+    ):
+        """Sum over modes data and return plus and cross GW polarizations
+        for many observer orientations at once.
+
+        The spin-weighted spherical harmonics of all orientations are
+        evaluated as one `(n_orientations, n_modes)` matrix, and the
+        polarizations of all orientations are obtained with a single matrix
+        product with the modes.
+
+        Args:
+            inclinations (array_like): Inclination angles between the
+                line-of-sight orbital angular momentum vector [radians]
+            coa_phases (array_like): Coalesence orbital phases [radians],
+                broadcast against `inclinations`
+            f_ref (float, optional) : The reference frequency.
+            t_ref (float, optional) : The reference time.
+            tol (float, optional) : The tolerance to allow for
+                                    floating point precision errors
+                                    in the computation of rotation
+                                    angles. Default value is 1e-6.
+
+        Returns:
+            sxs.TimeSeries: Complex polarizations, with time along the first
+                axis and the orientations along the second, as returned by
+                `evaluate` for a set of directions
+        """
+        import quaternionic
+        import spherical
+
+        angles = self.get_angles_batch(inclinations, coa_phases, f_ref, t_ref, tol)
+        directions = np.stack([angles["theta"], angles["psi"], angles["alpha"]], -1)
+
+        self.load_modes()
+        if not np.array_equal(self.frame, np.atleast_2d(quaternionic.one)):
+            # Time-dependent frame
+            return self.evaluate(directions)
+
+        rotors = quaternionic.array.from_euler_angles(
+            angles["psi"], angles["theta"], angles["alpha"]
+        )
+        wigner = spherical.Wigner(
+            self.ell_max, ell_min=self.ell_min, mp_max=abs(self.spin_weight)
+        )
+        sYlm = wigner.sYlm(self.spin_weight, rotors.reshape(-1, 4))
+        polarizations = self.ndarray @ sYlm.T
+        return sxs_TimeSeries(
+            polarizations.reshape(self.n_times, *directions.shape[:-1]), self.time
+        )
+
     def get_td_waveform(
         self,
         total_mass,
@@ -429,17 +782,66 @@ class WaveformModes(sxs_WaveformModes):
             pycbc.TimeSeries(numpy.complex128): Complex polarizations
                 stored in `pycbc` container `TimeSeries`
         """
+        return self.get_td_waveforms(
+            [total_mass],
+            distance,
+            inclination,
+            coa_phase,
+            delta_t=delta_t,
+            f_ref=f_ref,
+            t_ref=t_ref,
+            k=k,
+            kind=kind,
+            tol=tol,
+        )[0]
+
+    def get_td_waveforms(
+        self,
+        total_masses,
+        distance,
+        inclination,
+        coa_phase,
+        delta_t=None,
+        f_ref=None,
+        t_ref=None,
+        k=3,
+        kind=None,
+        tol=1e-6,
+    ):
+        """Plus and cross GW polarizations, as from `get_td_waveform`, for
+        several total masses at once.
+
+        The rotation angles, the sum over modes and its amplitude and phase
+        interpolants do not depend on the total mass, and are computed once
+        for all masses. Only the resampling and rescaling are repeated for
+        every mass.
+
+        Args:
+            total_masses (iterable of float): Total masses (Solar Masses)
+            distance (float): Distance to Source (Megaparsecs)
+            inclination (float): Inclination angle between the line-of-sight
+                orbital angular momentum vector [radians]
+            coa_phase (float): Coalesence orbital phase [radians]
+            delta_t (float, optional): Sample rate (in Hz or M). Defaults to
+                the time step of the modes.
+            f_ref (float, optional) : The reference frequency.
+            t_ref (float, optional) : The reference time.
+            k (int, optional) : The interpolation order, as for
+                `get_td_waveform`. Defaults to 3.
+            kind (str, optional) : The interpolation kind, as for
+                `get_td_waveform`. Defaults to None.
+            tol (float, optional) : The tolerance to allow for
+                                    floating point precision errors
+                                    in the computation of rotation
+                                    angles. Default value is 1e-6.
+        Returns:
+            list(pycbc.TimeSeries(numpy.complex128)): Complex polarizations
+                for every total mass, stored in `pycbc` container `TimeSeries`
+        """
         if delta_t is None:
-            delta_t = stat_mode(np.diff(self.time), keepdims=True)[0][0]
-        m_secs = utils.time_to_physical(total_mass)
-        # we assume that we generally do not sample at a rate below 128Hz.
-        # Therefore, depending on the numerical value of dt, we deduce whether
-        # dt is in dimensionless units or in seconds.
-        if delta_t > 1.0 / 128:
-            new_time = np.arange(min(self.time), max(self.time), delta_t)
-        else:
-            new_time = np.arange(min(self.time), max(self.time), delta_t / m_secs)
+            delta_t = self.time_step
 
+        self.load_modes()
         # Get angles
         angles = self.get_angles(
             inclination=inclination,
@@ -448,16 +850,32 @@ class WaveformModes(sxs_WaveformModes):
             t_ref=t_ref,
             tol=tol,
         )
-        h = interpolate_in_amp_phase(
-            self.evaluate([angles["theta"], angles["psi"], angles["alpha"]]),
-            new_time,
-            k=k,
-            kind=kind,
-        ) * utils.amp_to_physical(total_mass, distance)
-        
-        h.time *= m_secs
-        # Return conjugated waveform to comply with lal
-        return self.to_pycbc(np.conjugate(h))
+        h = self.evaluate([angles["theta"], angles["psi"], angles["alpha"]])
+        interpolant = AmpPhaseInterpolant(h.time, h.ndarray, k=k, kind=kind)
+
+        waveforms = []
+        for total_mass in total_masses:
+            m_secs = utils.time_to_physical(total_mass)
+            # we assume that we generally do not sample at a rate below 128Hz.
+            # Therefore, depending on the numerical value of dt, we deduce
+            # whether dt is in dimensionless units or in seconds.
+            if delta_t > 1.0 / 128:
+                new_time = np.arange(h.time[0], h.time[-1], delta_t)
+                physical_delta_t = delta_t * m_secs
+            else:
+                new_time = np.arange(h.time[0], h.time[-1], delta_t / m_secs)
+                physical_delta_t = delta_t
+            h_mass = interpolant(new_time)
+            h_mass *= utils.amp_to_physical(total_mass, distance)
+            # Return conjugated waveform to comply with lal
+            waveforms.append(
+                self.to_pycbc(
+                    np.conjugate(h_mass, out=h_mass),
+                    delta_t=physical_delta_t,
+                    epoch=new_time[0] * m_secs,
+                )
+            )
+        return waveforms
 
     def get_angles(self, inclination, coa_phase, f_ref=None, t_ref=None, tol=1e-6):
         """Get the inclination, azimuthal and polarization angles
@@ -493,16 +911,89 @@ class WaveformModes(sxs_WaveformModes):
         )
 
         # Compute angles
-        with h5py.File(self.filepath) as h5_file:
-            angles = get_nr_to_lal_rotation_angles(
-                h5_file=h5_file,
-                sim_metadata=self.sim_metadata,
-                inclination=inclination,
-                phi_ref=obs_phi_ref,
-                f_ref=f_ref,
-                t_ref=t_ref,
-                tol=tol,
-            )
+        angles = get_rotation_angles_from_lal_frame(
+            self.get_lal_frame(f_ref=f_ref, t_ref=t_ref),
+            inclination=inclination,
+            phi_ref=obs_phi_ref,
+            tol=tol,
+        )
+
+        return angles
+
+    def get_lal_frame(self, f_ref=None, t_ref=None):
+        """Get the basis vectors of the LAL source frame in the NR source
+        frame. Computed once for every reference frequency and time.
+
+        Parameters
+        ----------
+        f_ref, t_ref : float, optional
+                    The reference frquency and time to define the LAL source frame.
+                     Defaults to the available frequency in the data file.
+
+        Returns
+        -------
+        lal_frame : dict
+                    The LAL source frame, as returned by
+                    `lvc.get_nr_to_lal_frame`.
+        """
+        lal_frames = getattr(self, "_lal_frames", None)
+        if lal_frames is None:
+            lal_frames = self._lal_frames = {}
+        if (f_ref, t_ref) not in lal_frames:
+            with h5py.File(self.filepath) as h5_file:
+                lal_frames[(f_ref, t_ref)] = get_nr_to_lal_frame(
+                    h5_file=h5_file,
+                    sim_metadata=self.sim_metadata,
+                    f_ref=f_ref,
+                    t_ref=t_ref,
+                )
+        return lal_frames[(f_ref, t_ref)]
+
+    def get_angles_batch(
+        self, inclinations, coa_phases, f_ref=None, t_ref=None, tol=1e-6
+    ):
+        """Get the inclination, azimuthal and polarization angles
+        of many observers in the NR source frame.
+
+        Parameters
+        ----------
+        inclinations : array_like
+                       The inclination angles of the observers
+                       in the LAL source frame
+        coa_phases : array_like
+                     The coalescence phases, broadcast against
+                     `inclinations`.
+        f_ref, t_ref : float, optional
+                    The reference frquency and time to define the LAL source frame.
+                     Defaults to the available frequency in the data file.
+        tol : float, optional
+              The tolerance to allow for floating point precision errors
+              in the computation of rotation angles. Default value is 1e-6.
+
+        Returns
+        -------
+        angles : dict
+                 The arrays of angular corrdinates Theta, Psi, and the
+                 rotation angle Alpha, of the broadcast shape of the inputs.
+                 If available, this also contains the reference time and
+                 frequency.
+        """
+        inclinations, coa_phases = np.broadcast_arrays(
+            np.asarray(inclinations, dtype=float), np.asarray(coa_phases, dtype=float)
+        )
+
+        # The observer reference phases only differ by their offset in
+        # coalescence phase
+        obs_phi_refs = self.get_obs_phi_ref_from_obs_coa_phase(
+            coa_phase=coa_phases, t_ref=t_ref, f_ref=f_ref
+        )
+
+        angles = get_rotation_angles_from_lal_frame_array(
+            self.get_lal_frame(f_ref=f_ref, t_ref=t_ref),
+            inclinations=inclinations,
+            phi_refs=obs_phi_refs,
+            tol=tol,
+        )
 
         return angles
 
@@ -512,7 +1003,10 @@ class WaveformModes(sxs_WaveformModes):
         if epoch is None:
             epoch = input_array.time[0]
         if delta_t is None:
-            delta_t = stat_mode(np.diff(input_array.time), keepdims=True)[0][0]
+            if isinstance(input_array, WaveformModes):
+                delta_t = input_array.time_step
+            else:
+                delta_t = utils.estimate_time_step(input_array.time)
         return TimeSeries(
             np.array(input_array),
             delta_t=delta_t,
@@ -527,16 +1021,8 @@ class WaveformModes(sxs_WaveformModes):
         # Get the waveform phase.
         phase_22 = self._get_phase(2, 2)
 
-        waveform_22 = (
-            self.get_mode_data(2, 2)[:, 1] + 1j * self.get_mode_data(2, 2)[:, 2]
-        )
-
-        # print(len(phase_22), len(waveform_22))
-        # Get the localtion of max amplitude.
-
-        maxloc = np.argmax(np.absolute(waveform_22))
         # Compute the orbital phase at max amplitude.
-        coa_phase = phase_22[maxloc] / 2
+        coa_phase = phase_22[self.peak_index] / 2
 
         return coa_phase
 
@@ -544,20 +1030,23 @@ class WaveformModes(sxs_WaveformModes):
         """Get the observer reference phase given the observer
         coalescence phase."""
 
-        # Get the NR coalescence phase
-        nr_coa_phase = self.get_nr_coa_phase()
-        # Get the NR orbital phasing series
-        nr_orb_phase_ts = self._get_phase(2, 2) / 2
+        # The NR phases do not depend on the observer, and are computed once
+        if getattr(self, "_nr_ref_phases", None) is None:
+            # Get the NR coalescence phase
+            nr_coa_phase = self.get_nr_coa_phase()
 
-        # Compute the observer reference phase from
-        # this information.
+            # Compute the observer reference phase from
+            # this information.
 
-        avail_t_ref = self.t_ref_nr
+            avail_t_ref = self.t_ref_nr
 
-        # Second, get the NR reference phase
-        from scipy.interpolate import interp1d
-
-        nr_phi_ref = interp1d(self.time, nr_orb_phase_ts, kind="cubic")(avail_t_ref)
+            # Second, get the NR reference phase from the NR orbital phasing
+            # series, with a spline through the samples around it
+            nr_phi_ref = (
+                _local_spline_value(self.time, self._get_phase(2, 2), avail_t_ref) / 2
+            )
+            self._nr_ref_phases = (nr_phi_ref, nr_coa_phase)
+        nr_phi_ref, nr_coa_phase = self._nr_ref_phases
 
         # Third, compute the offset in coa_phase
         delta_phi_ref = coa_phase - nr_coa_phase
@@ -574,16 +1063,31 @@ class WaveformModes(sxs_WaveformModes):
         return self.to_pycbc().to_astropy()
 
     def _get_phase(self, ell=2, emm=2):
-        """Get the phasing of a particular waveform mode."""
-
-        # Get the complex waveform.
-        wfm_array = self.get_mode_data(ell, emm)
-        waveform_lm_re = wfm_array[:, 1]
-        waveform_lm_im = wfm_array[:, 2]
-        waveform_lm = waveform_lm_re + 1j * waveform_lm_im
-        # Get the waveform phase.
-        phase_lm = np.unwrap(np.angle(waveform_lm))
-        return phase_lm
+        """Get the phasing of a particular waveform mode. Computed once
+        for every mode, and returned read-only."""
+        phases = getattr(self, "_phases", None)
+        if phases is None:
+            phases = self._phases = {}
+        if (ell, emm) not in phases:
+            # Get the complex waveform.
+            self.load_modes([(ell, emm)])
+            waveform_lm = self.ndarray[:, self.index(ell, emm)]
+            # Get the waveform phase.
+            phase_lm = np.unwrap(np.angle(waveform_lm))
+            phase_lm.flags.writeable = False
+            phases[(ell, emm)] = phase_lm
+        return phases[(ell, emm)]
+
+    def _get_orbital_frequency(self):
+        """Get the orbital angular frequency series, from second order
+        finite differences of the phasing of the 2,2 mode. Computed once."""
+        if getattr(self, "_orbital_frequency", None) is None:
+            nr_orb_phase_ts = self._get_phase(2, 2) / 2
+            self._orbital_frequency = np.gradient(
+                nr_orb_phase_ts, self.time, edge_order=2
+            )
+            self._orbital_frequency.flags.writeable = False
+        return self._orbital_frequency
 
     def _compute_reference_time(self):
         """Obtain the reference time from the
@@ -618,12 +1122,8 @@ class WaveformModes(sxs_WaveformModes):
             if ref_omega is None:
                 raise KeyError("Could not compute reference omega!")
 
-            nr_orb_phase_ts = self._get_phase(2, 2) / 2
-
             # Differentiate the phase to get orbital angular frequency
-            from waveformtools.differentiate import derivative
-
-            nr_omega_ts = derivative(self.time, nr_orb_phase_ts, method="FD", degree=2)
+            nr_omega_ts = self._get_orbital_frequency()
             # Identify the location in time where nr_omega = ref_omega
             ref_loc = np.argmin(np.absolute(nr_omega_ts - ref_omega))
             avail_t_ref = self.time[ref_loc]
@@ -644,6 +1144,117 @@ class WaveformModes(sxs_WaveformModes):
         return self._t_ref_nr
 
 
+def _local_spline_value(x, y, x0, num_points=8):
+    """Value at `x0` of a cubic spline through the `num_points` samples
+    around it, instead of through all samples.
+
+    Parameters
+    ----------
+    x, y : ndarray
+           The samples.
+    x0 : float
+         The point to evaluate the spline at, within the range of `x`.
+    num_points : int, optional
+                 The number of samples to fit the spline to. Default is 8.
+
+    Returns
+    -------
+    value : ndarray
+            The 0-d array of the value of the spline at `x0`.
+    """
+    if not x[0] <= x0 <= x[-1]:
+        raise ValueError(f"{x0} is outside the range [{x[0]}, {x[-1]}]")
+    idx = np.searchsorted(x, x0)
+    start = max(min(idx - num_points // 2, len(x) - num_points), 0)
+    window = slice(start, start + num_points)
+    return make_interp_spline(x[window], y[window], k=3)(x0)
+
+
+class AmpPhaseInterpolant:
+    """Interpolant of complex time series in their amplitude and
+    (unwrapped) phase.
+
+    The series are decomposed into amplitude and phase, and the splines
+    through them are fitted, once. The interpolant can then be evaluated
+    on any number of new time grids, reusing the spline coefficients.
+
+    Args:
+        time (array_like): The time samples.
+        data (array_like): The complex values, with time along `axis`.
+            This can hold several series, e.g. the modes of a waveform,
+            which are all interpolated at once.
+        k (int, optional): The order of the interpolating spline, as with
+            `scipy.interpolate.InterpolatedUnivariateSpline`. This gets
+            preference over `kind`. Defaults to 3.
+        kind (str, optional): The interpolation kind of
+            `scipy.interpolate.interp1d` (`linear`, `quadratic`, `cubic`),
+            or `CubicSpline` to use `scipy.interpolate.CubicSpline`, when
+            `k` is None. Defaults to None.
+        axis (int, optional): The time axis of `data`. Defaults to 0.
+    """
+
+    def __init__(self, time, data, k=3, kind=None, axis=0):
+        from scipy.interpolate import CubicSpline, interp1d
+
+        time = np.asarray(time)
+        data = np.asarray(data)
+        self.axis = axis % data.ndim
+        amp = np.abs(data)
+        phase = np.unwrap(np.angle(data), axis=self.axis)
+
+        if k is not None and k % 2 == 0:
+            # Interpolating splines of even order have knots between the
+            # samples with `make_interp_spline`, but at the samples with
+            # `InterpolatedUnivariateSpline`: fit every series separately
+            self._shape = np.moveaxis(data, self.axis, -1).shape[:-1]
+            self._interpolants = [
+                [
+                    InterpolatedUnivariateSpline(time, series, k=k)
+                    for series in np.moveaxis(values, self.axis, -1).reshape(
+                        -1, len(time)
+                    )
+                ]
+                for values in [amp, phase]
+            ]
+        elif k is not None:
+            # Same knots as `InterpolatedUnivariateSpline`, for all series
+            self._interpolants = [
+                make_interp_spline(time, values, k=k, axis=self.axis)
+                for values in [amp, phase]
+            ]
+        elif kind == "CubicSpline":
+            self._interpolants = [
+                CubicSpline(time, values, axis=self.axis) for values in [amp, phase]
+            ]
+        else:
+            self._interpolants = [
+                interp1d(time, values, kind=kind, axis=self.axis)
+                for values in [amp, phase]
+            ]
+
+    def _evaluate(self, interpolant, new_time):
+        if not isinstance(interpolant, list):
+            return interpolant(new_time)
+        values = np.stack([series(new_time) for series in interpolant], axis=-1)
+        values = values.reshape(np.shape(new_time) + self._shape)
+        return np.moveaxis(values, np.arange(np.ndim(new_time)), self.axis)
+
+    def __call__(self, new_time):
+        """Evaluate the interpolant.
+
+        Args:
+            new_time (array_like): The new time axis to interpolate onto.
+
+        Returns:
+            numpy.ndarray: The complex values, with the new times along
+                the time axis.
+        """
+        amp, phase = [
+            self._evaluate(interpolant, new_time) for interpolant in self._interpolants
+        ]
+        return amp * np.exp(1j * phase)
+
+
 def interpolate_in_amp_phase(obj, new_time, k=3, kind=None):
     """Interpolate in amplitude and phase
     using a variety of interpolation methods.
@@ -652,7 +1263,9 @@ def interpolate_in_amp_phase(obj, new_time, k=3, kind=None):
     ---------
     obj: sxs.TimeSeries
         The TimeSeries object that holds the complex
-        waveform to be interpolated.
+        waveform to be interpolated, e.g. polarizations or
+        the modes of `WaveformModes`, all of which are
+        interpolated at once along the time axis.
     new_time: array_like
           The new time axis to interpolate onto.
 
@@ -669,9 +1282,10 @@ def interpolate_in_amp_phase(obj, new_time, k=3, kind=None):
         i.e. the parameter `k` will be used instead.
     See Also
     --------
-    waveformtools.waveformtools.interp_resam_wfs :
-        The function that interpolates in amplitude
-        and phases using scipy interpolators.
+    AmpPhaseInterpolant :
+        The interpolant used, which can be evaluated
+        on several time axes to resample the same
+        object onto multiple grids.
 
     scipy.interpolate.CubicSpline:
         One of the possible methods that can
@@ -687,17 +1301,9 @@ def interpolate_in_amp_phase(obj, new_time, k=3, kind=None):
     interpolated function passes through all the
     data points.
     """
-    from waveformtools.waveformtools import interp_resam_wfs
-
-    resam_data = interp_resam_wfs(
-        wavf_data=np.array(obj),
-        old_taxis=obj.time,
-        new_taxis=new_time,
-        k=k,
-        kind=kind,
-    )
-
-    resam_data = SXSTimeSeries(resam_data, new_time)
+    resam_data = AmpPhaseInterpolant(
+        obj.time, obj.ndarray, k=k, kind=kind, axis=obj.time_axis
+    )(new_time)
 
     metadata = obj._metadata.copy()
     metadata["time"] = new_time
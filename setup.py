@@ -120,5 +120,5 @@ if __name__ == "__main__":
             "template.data": [],
         },
         install_requires=get_requirements(),
-        scripts=[],
+        scripts=["bin/download_catalog.py"],
     )
@@ -1,8 +1,12 @@
 """ Helper and diagnostic function for tests """
 
+import contextlib
 import datetime
+import functools
 import os
+import threading
 import traceback
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from inspect import getframeinfo, stack
 
 import numpy as np
@@ -15,7 +19,7 @@ def message(
     message_verbosity=2,
     print_verbosity=config.print_verbosity,
     log_verbosity=config.log_verbosity,
-    **kwargs
+    **kwargs,
 ):
     """The print function with verbosity levels and logging facility.
 
@@ -116,3 +120,137 @@ def rms_errs(func1, func2, Norm=False):
     RMS = np.sqrt(np.sum(np.absolute(diff) ** 2) / len(func1)) / A1max
 
     return RMS, Amin, Amax
+
+
+class QuietHTTPRequestHandler(SimpleHTTPRequestHandler):
+    """Serve files from a directory without logging every request"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RangeHTTPRequestHandler(QuietHTTPRequestHandler):
+    """Serve files, honouring open-ended byte range requests
+    (`Range: bytes=<start>-`) like the web servers hosting the catalogs"""
+
+    def send_head(self):
+        range_header = self.headers.get("Range")
+        path = self.translate_path(self.path)
+        if range_header is None or not os.path.isfile(path):
+            return super().send_head()
+        size = os.path.getsize(path)
+        start = int(range_header.replace("bytes=", "").split("-")[0])
+        if start >= size:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+        f = open(path, "rb")
+        f.seek(start)
+        self.send_response(206)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+        self.send_header("Content-Length", str(size - start))
+        self.end_headers()
+        return f
+
+
+@contextlib.contextmanager
+def serve_directory(directory, handler_class=QuietHTTPRequestHandler):
+    """Serve the contents of a directory over HTTP on localhost.
+
+    This is a stand-in for the web servers hosting the NR catalogs.
+
+    Parameters
+    ----------
+    directory : str
+                The directory to serve.
+    handler_class : class
+                    The request handler to use.
+
+    Returns
+    -------
+    url : str
+          The root URL of the served directory.
+    """
+    handler = functools.partial(handler_class, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield "http://127.0.0.1:{}".format(server.server_address[1])
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def synthetic_mode_data(time, ell, em):
+    """Amplitude and phase of a toy inspiral-merger-ringdown (ell, em) mode,
+    whose amplitude peaks at t = 0.
+
+    Parameters
+    ----------
+    time : ndarray
+           The times to evaluate the mode at.
+    ell, em : int
+              The mode.
+
+    Returns
+    -------
+    amp, phase : ndarray
+                 The amplitude and phase of the mode.
+    """
+    omega = 0.03 + 0.27 / (1 + np.exp(-time / 15.0))
+    orbital_phase = np.concatenate(
+        [[0], np.cumsum(0.5 * (omega[1:] + omega[:-1]) * np.diff(time))]
+    )
+    amp = (0.05 + 0.35 * np.exp(-((time / 40.0) ** 2))) * 0.5 ** (ell - 2)
+    amp = amp * (1 + 0.1 * abs(em))
+    return amp, -em * orbital_phase
+
+
+def write_mode_file(path, ell_max=4, layout="maya", t_start=-1000.0, dt=0.5):
+    """Write a waveform HDF5 file in the RIT/MAYA format, with the
+    groups `amp_l{ell}_m{em}` and `phase_l{ell}_m{em}`, each holding the
+    time samples `X` and values `Y`, and the attributes defining the LAL
+    source frame at the reference time.
+
+    Parameters
+    ----------
+    path : str
+           The file to write.
+    ell_max : int
+              The largest ell of the modes written.
+    layout : str
+             "maya" to sample all modes at the same, uniform times, or
+             "rit" to sample every mode at its own times, and add other
+             groups and attributes like RIT files.
+    t_start, dt : float
+                  The first time sample and the time step.
+    """
+    import h5py
+
+    with h5py.File(path, "w") as h5_file:
+        if layout == "rit":
+            h5_file.attrs["name"] = "RIT:BBH:0001-n100-id0"
+            h5_file.attrs["Format"] = 1
+            h5_file.create_group("auxiliary-info")
+            h5_file["auxiliary-info"]["Omega-vs-time"] = np.zeros(10)
+        h5_file.attrs["reference_time"] = t_start + 100.0
+        for name, value in zip(["LNhat", "nhat"], [[0.0, 0.0, 1.0], [1.0, 0.0, 0.0]]):
+            for axis, component in zip("xyz", value):
+                h5_file.attrs[f"{name}{axis}"] = component
+        time = np.arange(t_start, 100.0 + 0.5 * dt, dt)
+        for ell in range(2, ell_max + 1):
+            for em in range(-ell, ell + 1):
+                if layout == "rit":
+                    # Slightly different time samples for each mode
+                    mode_dt = dt * (1 - 0.01 * (ell + em + ell_max) / ell_max)
+                    time = np.arange(t_start, 100.0 + 0.5 * mode_dt, mode_dt)
+                amp, phase = synthetic_mode_data(time, ell, em)
+                for name, values in [("amp", amp), ("phase", phase)]:
+                    group = h5_file.create_group(f"{name}_l{ell}_m{em}")
+                    group["X"] = time
+                    group["Y"] = values
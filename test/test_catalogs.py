@@ -0,0 +1,335 @@
+""" Test building catalogs from metadata tables,
+without accessing the web.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+cwd = os.getcwd()
+
+libpath = f"{cwd}/../"
+
+if libpath not in sys.path:
+    sys.path.append(libpath)
+
+import unittest
+import unittest.mock
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from nrcatalogtools import cache, catalog
+from nrcatalogtools.maya import MayaCatalog
+from nrcatalogtools.rit import RITCatalog
+from nrcatalogtools.sxs import SXSCatalog
+
+from helper import write_mode_file
+
+
+class TestMetadataCache(unittest.TestCase):
+    """Test the binary cache of parsed metadata tables"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.source_path = Path(self.tmp_dir.name) / "metadata.csv"
+        self.df = pd.DataFrame(
+            {
+                "simulation_name": ["RIT:BBH:0001-n100-id0", "RIT:BBH:0002-n100-id0"],
+                "relaxed-mass-ratio-1-over-2": [1.0, np.nan],
+            }
+        )
+        self.df.to_csv(self.source_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_roundtrip(self):
+        """A table read back from the cache is the table written"""
+        self.assertIsNone(cache.read_dataframe_cache(self.source_path))
+        self.assertTrue(cache.write_dataframe_cache(self.df, self.source_path))
+        pd.testing.assert_frame_equal(
+            cache.read_dataframe_cache(self.source_path), self.df
+        )
+
+    def test_pickle_fallback(self):
+        """Without pyarrow, the cache is pickled, and both formats
+        read back a table with a default index"""
+        df = self.df.set_index(pd.Index([5, 7]))
+        for columnar_format in ["feather", "pickle"]:
+            with unittest.mock.patch.object(
+                cache, "_columnar_format", return_value=columnar_format
+            ):
+                self.assertTrue(cache.write_dataframe_cache(df, self.source_path))
+            key_path = Path(self.tmp_dir.name) / "metadata.csv.cache.json"
+            with open(key_path) as f:
+                self.assertEqual(json.load(f)["format"], columnar_format)
+            pd.testing.assert_frame_equal(
+                cache.read_dataframe_cache(self.source_path),
+                df.reset_index(drop=True),
+            )
+
+    def test_invalidation(self):
+        """The cache is ignored once the source file changes"""
+        cache.write_dataframe_cache(self.df, self.source_path)
+        self.df.iloc[:1].to_csv(self.source_path)
+        self.assertIsNone(cache.read_dataframe_cache(self.source_path))
+
+
+class TestCatalogConstruction(unittest.TestCase):
+    """Test building the per-simulation metadata from catalog tables"""
+
+    def test_maya_table_cleaning(self):
+        """MAYA catalog entries are stripped and parsed as floats"""
+        lines = [
+            "| GTID | GT_Tag | q | Momega |",
+            "|---|---|---|---|",
+            "| GT0001 | D11_q1.00_a0.0_m100 | 1.0 | 0.0205 |",
+            "| GT0002 | D11_q2.00_a0.0_m100 | 2.5 | - |",
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = Path(tmp_dir) / "catalog.zip"
+            with zipfile.ZipFile(zip_path, "w") as catalog_zip:
+                catalog_zip.writestr("catalog.txt", "\n".join(lines) + "\n")
+            catalog_df = MayaCatalog._read_catalog_zip(zip_path)
+
+        self.assertEqual(list(catalog_df["GTID"]), ["GT0001", "GT0002"])
+        self.assertEqual(
+            list(catalog_df["GT_Tag"]), ["D11_q1.00_a0.0_m100", "D11_q2.00_a0.0_m100"]
+        )
+        self.assertEqual(list(catalog_df["q"]), [1.0, 2.5])
+        self.assertEqual(catalog_df["Momega"][0], 0.0205)
+        self.assertTrue(np.isnan(catalog_df["Momega"][1]))
+        self.assertEqual(catalog_df["Momega"].dtype, np.float64)
+
+    def test_simulations_from_dataframe(self):
+        """One metadata dict per simulation, the last row winning"""
+        df = pd.DataFrame(
+            {
+                "simulation_name": ["RIT:BBH:0001", "RIT:BBH:0002", "RIT:BBH:0001"],
+                "eccentricity": [0.1, 0.2, 0.3],
+            }
+        )
+        simulations = catalog.simulations_from_dataframe(df, "simulation_name")
+        self.assertEqual(len(simulations), 2)
+        self.assertEqual(
+            simulations["RIT:BBH:0001"],
+            {"simulation_name": "RIT:BBH:0001", "eccentricity": 0.3},
+        )
+        self.assertEqual(
+            simulations["RIT:BBH:0002"],
+            {"simulation_name": "RIT:BBH:0002", "eccentricity": 0.2},
+        )
+        self.assertNotIn("RIT:BBH:0003", simulations)
+
+    def test_derived_columns_are_lazy(self):
+        """Derived columns are only computed for the simulations accessed"""
+        df = pd.DataFrame({"GTID": ["GT0001", "GT0002"], "q": [1.0, 2.0]})
+        simulations = catalog.simulations_from_dataframe(df, "GTID")
+        accessed = []
+
+        def location(sim_name):
+            accessed.append(sim_name)
+            return f"/data/{sim_name}.h5"
+
+        simulations.add_derived_column("waveform_data_location", location)
+        self.assertEqual(accessed, [])
+        self.assertEqual(
+            simulations["GT0002"]["waveform_data_location"], "/data/GT0002.h5"
+        )
+        simulations["GT0002"]
+        self.assertEqual(accessed, ["GT0002"])
+        self.assertEqual(
+            list(simulations.to_dataframe()["waveform_data_location"]),
+            ["/data/GT0001.h5", "/data/GT0002.h5"],
+        )
+
+    def test_construction_time(self):
+        """Guard against regressing to building the metadata of every
+        simulation up front, which takes over a second for a table of this
+        size when done row by row"""
+        num_sims, num_fields = 20000, 60
+        df = pd.DataFrame(
+            np.random.default_rng(0).random((num_sims, num_fields)),
+            columns=[f"field-{n}" for n in range(num_fields)],
+        )
+        df["simulation_name"] = [f"RIT:BBH:{idx:05d}" for idx in range(num_sims)]
+        start = time.perf_counter()
+        simulations = catalog.simulations_from_dataframe(df, "simulation_name")
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(simulations), num_sims)
+        self.assertLess(elapsed, 0.5)
+
+
+class TestNameIndex(unittest.TestCase):
+    """Test looking up simulations by name, alias and in any case"""
+
+    def test_rit_names(self):
+        df = pd.DataFrame(
+            {
+                "simulation_name": ["RIT:BBH:0001-n100-id3", "RIT:eBBH:0002-n120-ecc"],
+                "eccentricity": [0.0, 0.1],
+            }
+        )
+        simulations = catalog.simulations_from_dataframe(df, "simulation_name")
+        rit = RITCatalog(catalog={"simulations": simulations})
+        for alias in ["RIT:BBH:0001-n100-id3", "RIT:BBH:0001", "rit:bbh:0001"]:
+            self.assertEqual(
+                rit.resolve_simulation_name(alias), "RIT:BBH:0001-n100-id3"
+            )
+        self.assertEqual(
+            rit.get_metadata("RIT:EBBH:0002")["simulation_name"],
+            "RIT:eBBH:0002-n120-ecc",
+        )
+        with self.assertRaises(IOError):
+            rit.get_metadata("RIT:BBH:0003")
+
+    def test_maya_names(self):
+        df = pd.DataFrame(
+            {
+                "GTID": ["GT0001", "GT0002", "GT0003"],
+                "GT_Tag": ["D11_q1.00_a0.0_m100", "D11_q2.00_a0.0_m100", "GT0001"],
+            }
+        )
+        simulations = catalog.simulations_from_dataframe(df, "GTID")
+        maya = MayaCatalog(catalog={"simulations": simulations})
+        self.assertEqual(maya.resolve_simulation_name("gt0002"), "GT0002")
+        self.assertEqual(maya.resolve_simulation_name("D11_q2.00_a0.0_m100"), "GT0002")
+        # A simulation name takes precedence over the same alias
+        self.assertEqual(maya.resolve_simulation_name("GT0001"), "GT0001")
+
+    def test_ambiguous_alias(self):
+        df = pd.DataFrame(
+            {"simulation_name": ["RIT:BBH:0001-n100-id3", "RIT:BBH:0001-n120-id3"]}
+        )
+        simulations = catalog.simulations_from_dataframe(df, "simulation_name")
+        rit = RITCatalog(catalog={"simulations": simulations})
+        with self.assertRaises(IOError):
+            rit.resolve_simulation_name("RIT:BBH:0001")
+
+
+class TestWaveformCache(unittest.TestCase):
+    """Test the in-memory cache of waveforms returned by `get`"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        sim_names = ["GT0001", "GT0002", "GT0003"]
+        df = pd.DataFrame({"GTID": sim_names, "q": [1.0, 2.0, 3.0]})
+        self.maya = MayaCatalog(
+            catalog={"simulations": catalog.simulations_from_dataframe(df, "GTID")}
+        )
+        self.maya.waveform_data_dir = Path(self.tmp_dir.name)
+        for sim_name in sim_names:
+            write_mode_file(
+                Path(self.tmp_dir.name) / f"{sim_name}.h5", ell_max=2, t_start=-200.0
+            )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_hits_and_misses(self):
+        wfm = self.maya.get("GT0001")
+        self.assertIs(self.maya.get("gt0001"), wfm)
+        self.assertIsNot(self.maya.get("GT0001", modes=[(2, 2)]), wfm)
+        self.assertEqual((self.maya.cache_hits, self.maya.cache_misses), (1, 2))
+        self.maya.clear_cache()
+        self.assertIsNot(self.maya.get("GT0001"), wfm)
+        self.assertEqual((self.maya.cache_hits, self.maya.cache_misses), (0, 1))
+
+    def test_eviction(self):
+        """The least recently used waveforms are evicted first"""
+        self.maya.waveform_cache_max_entries = 2
+        first = self.maya.get("GT0001")
+        second = self.maya.get("GT0002")
+        self.maya.get("GT0001")
+        self.maya.get("GT0003")
+        self.assertIs(self.maya.get("GT0001"), first)
+        self.assertIsNot(self.maya.get("GT0002"), second)
+        self.maya.waveform_cache_max_bytes = first.nbytes + 1
+        self.maya.get("GT0003", lazy=True)
+        self.assertEqual(len(self.maya._waveforms), 1)
+
+
+def fake_sxs_catalog(num_sims):
+    """SXS catalog with several versions and resolutions per simulation"""
+    records, simulations = {}, {}
+    for idx in range(1, 1 + num_sims):
+        sim_name = f"SXS:BBH:{idx:04d}"
+        for version in range(1, 2 + idx % 2):
+            records[f"{idx}v{version}"] = {
+                "title": f"{sim_name}v{version}",
+                "version": version,
+                "files": [
+                    {
+                        "filename": f"{sim_name}/Lev{lev}/{file_name}",
+                        "checksum": f"{version}/{lev}/{file_name}",
+                        "filesize": idx,
+                        "links": {"download": ""},
+                    }
+                    for lev in range(3, 5 + idx % 2)
+                    for file_name in [
+                        "rhOverM_Asymptotic_GeometricUnits_CoM.h5",
+                        "metadata.json",
+                        "metadata.txt",
+                    ]
+                ],
+            }
+        simulations[sim_name] = {"simulation_name": sim_name}
+    return {
+        "catalog_file_description": "",
+        "modified": "",
+        "records": records,
+        "simulations": simulations,
+    }
+
+
+class TestSXSPaths(unittest.TestCase):
+    """Test resolving the paths of SXS simulation files"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path_index_file = Path(self.tmp_dir.name) / "paths.json"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_catalog(self):
+        sxs_catalog = SXSCatalog(fake_sxs_catalog(4))
+        sxs_catalog.path_index_file = self.path_index_file
+        return sxs_catalog
+
+    def test_paths_match_select_files(self):
+        """Paths from the index are those found by searching all files"""
+        sxs_catalog = self.make_catalog()
+        for sim_name in sxs_catalog.simulations:
+            for file_type, pattern in [
+                ("waveform", "{}/Lev/rhOverM"),
+                ("metadata", "{}/Lev/metadata.json"),
+            ]:
+                poss_files = sxs_catalog.select_files(pattern.format(sim_name))
+                truepath = poss_files[list(poss_files.keys())[0]]["truepath"]
+                self.assertEqual(sxs_catalog.path_index[sim_name][file_type], truepath)
+        self.assertEqual(
+            sxs_catalog.path_index["SXS:BBH:0001"]["metadata"],
+            "SXS:BBH:0001v2/Lev5/metadata.json",
+        )
+
+    def test_index_on_disk(self):
+        """The index is written once and read back by later catalogs"""
+        path_index = self.make_catalog().path_index
+        self.assertTrue(self.path_index_file.exists())
+        sxs_catalog = self.make_catalog()
+        sxs_catalog._build_path_index = None
+        self.assertEqual(sxs_catalog.path_index, path_index)
+        self.assertTrue(
+            sxs_catalog.get_metadata("SXS:BBH:0002")["waveform_data_location"].endswith(
+                path_index["SXS:BBH:0002"]["waveform"]
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+""" Test downloading waveform data from a local
+HTTP server that stands in for the catalog websites.
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+
+cwd = os.getcwd()
+
+libpath = f"{cwd}/../"
+
+if libpath not in sys.path:
+    sys.path.append(libpath)
+
+import unittest
+from pathlib import Path
+
+import pandas as pd
+from nrcatalogtools import catalog, utils
+from nrcatalogtools.maya import MayaCatalog
+
+# unittest helper funcs
+from helper import QuietHTTPRequestHandler, RangeHTTPRequestHandler, serve_directory
+
+hosted_sims = ["GT0001", "GT0002", "GT0003"]
+
+
+class RecordingRangeHTTPRequestHandler(RangeHTTPRequestHandler):
+    """Serve byte ranges and record the path and Range of every GET"""
+
+    requests = []
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get("Range")))
+        super().do_GET()
+
+
+class FlakyHTTPRequestHandler(QuietHTTPRequestHandler):
+    """Fail every other request with 503 Service Unavailable, and record
+    the method of every request"""
+
+    requests = []
+
+    def do_HEAD(self):
+        self.requests.append("HEAD")
+        super().do_HEAD()
+
+    def do_GET(self):
+        self.requests.append("GET")
+        if len(self.requests) % 2 == 1:
+            self.send_error(503)
+            return
+        super().do_GET()
+
+
+class TestDownload(unittest.TestCase):
+    """Test bulk and resumable downloads"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.web_root = Path(self.tmp_dir.name) / "web"
+        self.web_root.mkdir()
+        self.contents = {}
+        for idx, sim_name in enumerate(hosted_sims):
+            self.contents[sim_name] = os.urandom(100000 + 1000 * idx)
+            (self.web_root / f"{sim_name}.h5").write_bytes(self.contents[sim_name])
+        self.data_dir = Path(self.tmp_dir.name) / "data"
+        self.data_dir.mkdir()
+        RecordingRangeHTTPRequestHandler.requests = []
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_catalog(self, url, sim_names):
+        df = pd.DataFrame({"GTID": sim_names})
+        maya = MayaCatalog(
+            catalog={"simulations": catalog.simulations_from_dataframe(df, "GTID")}
+        )
+        maya.waveform_data_url = url
+        maya.waveform_data_dir = self.data_dir
+        return maya
+
+    def test_download_all(self):
+        """All files are downloaded once, and then found on disk"""
+        with serve_directory(
+            self.web_root, handler_class=RecordingRangeHTTPRequestHandler
+        ) as url:
+            maya = self.make_catalog(url, hosted_sims)
+            summary = maya.download_all(workers=2, progress=False)
+            self.assertEqual(sorted(summary["downloaded"]), hosted_sims)
+            self.assertEqual(summary["failed"], {})
+            self.assertEqual(
+                summary["bytes"], sum(len(c) for c in self.contents.values())
+            )
+            for sim_name in hosted_sims:
+                self.assertEqual(
+                    (self.data_dir / f"{sim_name}.h5").read_bytes(),
+                    self.contents[sim_name],
+                )
+            self.assertEqual(list(self.data_dir.glob("*.part")), [])
+
+            num_requests = len(RecordingRangeHTTPRequestHandler.requests)
+            summary = maya.download_all(workers=2, progress=False)
+            self.assertEqual(sorted(summary["cached"]), hosted_sims)
+            self.assertEqual(
+                len(RecordingRangeHTTPRequestHandler.requests), num_requests
+            )
+
+    def test_missing_file(self):
+        """A simulation that cannot be downloaded does not stop the others"""
+        with serve_directory(self.web_root) as url:
+            maya = self.make_catalog(url, hosted_sims + ["GT0004"])
+            summary = maya.download_all(workers=4, progress=False)
+        self.assertEqual(sorted(summary["downloaded"]), hosted_sims)
+        self.assertEqual(list(summary["failed"]), ["GT0004"])
+        self.assertFalse((self.data_dir / "GT0004.h5").exists())
+
+    def test_resume(self):
+        """A partial download is resumed from where it stopped"""
+        content = self.contents["GT0002"]
+        path = self.data_dir / "GT0002.h5"
+        Path(str(path) + ".part").write_bytes(content[:40000])
+        with serve_directory(
+            self.web_root, handler_class=RecordingRangeHTTPRequestHandler
+        ) as url:
+            utils.download_file_resumable(
+                url + "/GT0002.h5",
+                path,
+                checksum=hashlib.md5(content).hexdigest(),
+            )
+        self.assertEqual(path.read_bytes(), content)
+        self.assertEqual(
+            RecordingRangeHTTPRequestHandler.requests,
+            [("/GT0002.h5", "bytes=40000-")],
+        )
+
+    def test_range_not_supported(self):
+        """The whole file is downloaded again if ranges are not supported"""
+        content = self.contents["GT0001"]
+        path = self.data_dir / "GT0001.h5"
+        Path(str(path) + ".part").write_bytes(content[:40000])
+        with serve_directory(
+            self.web_root, handler_class=QuietHTTPRequestHandler
+        ) as url:
+            utils.download_file_resumable(url + "/GT0001.h5", path)
+        self.assertEqual(path.read_bytes(), content)
+
+    def test_verification(self):
+        """Files that fail verification are not kept"""
+        path = self.data_dir / "GT0003.h5"
+        with serve_directory(self.web_root) as url:
+            with self.assertRaises(IOError):
+                utils.download_file_resumable(
+                    url + "/GT0003.h5", path, checksum="0" * 32
+                )
+            with self.assertRaises(IOError):
+                utils.download_file_resumable(url + "/GT0003.h5", path, filesize=1000)
+        self.assertEqual(list(self.data_dir.iterdir()), [])
+
+    def test_retry_without_head(self):
+        """Files are fetched with GET only, retrying transient errors"""
+        FlakyHTTPRequestHandler.requests = []
+        path = self.data_dir / "GT0001.h5"
+        utils.configure_http_session(retries=2, backoff_factor=0)
+        try:
+            with serve_directory(
+                self.web_root, handler_class=FlakyHTTPRequestHandler
+            ) as url:
+                utils.download_file(url + "/GT0001.h5", path)
+        finally:
+            utils.configure_http_session()
+        self.assertEqual(path.read_bytes(), self.contents["GT0001"])
+        self.assertEqual(FlakyHTTPRequestHandler.requests, ["GET", "GET"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,274 @@
+""" Test the RIT metadata crawler against a local
+HTTP server that stands in for the RIT catalog website.
+"""
+
+import os
+import sys
+import tempfile
+import urllib.parse
+
+cwd = os.getcwd()
+
+libpath = f"{cwd}/../"
+
+if libpath not in sys.path:
+    sys.path.append(libpath)
+
+import unittest
+from pathlib import Path
+
+import pandas as pd
+from nrcatalogtools.rit import RITCatalogHelper, RITMetadataJournal
+
+# unittest helper funcs
+from helper import QuietHTTPRequestHandler, serve_directory
+
+# Metadata files hosted by the fake RIT website.
+# Index 3 is missing, and index 5 exists at two resolutions,
+# of which the crawler should pick the first in search order.
+hosted_metadata_files = [
+    "RIT:BBH:0001-n100-id3_Metadata.txt",
+    "RIT:eBBH:0002-n120-ecc_Metadata.txt",
+    "RIT:BBH:0004-n140-id0_Metadata.txt",
+    "RIT:BBH:0005-n100-id1_Metadata.txt",
+    "RIT:BBH:0005-n120-id0_Metadata.txt",
+]
+expected_sim_names = [
+    "RIT:BBH:0001-n100-id3",
+    "RIT:eBBH:0002-n120-ecc",
+    "RIT:BBH:0004-n140-id0",
+    "RIT:BBH:0005-n100-id1",
+]
+# Waveform files hosted by the fake RIT website: only the first simulation
+hosted_waveform_files = ["ExtrapStrain_RIT-BBH-0001-n100.h5"]
+possible_res = [100, 120, 140]
+num_sims_to_crawl = 6
+
+
+def write_fake_rit_website(root):
+    """Write a directory tree mimicking the RIT catalog website"""
+    metadata_dir = Path(root) / "Metadata"
+    metadata_dir.mkdir(parents=True)
+    for idx, file_name in enumerate(hosted_metadata_files):
+        with open(metadata_dir / file_name, "w") as f:
+            f.write("# RIT metadata\n")
+            f.write("[metadata]\n")
+            f.write(f"catalog-tag = {file_name.split('_Meta')[0]}\n")
+            f.write(f"relaxed-mass-ratio-1-over-2 = {1.0 + idx}\n")
+            f.write(f"eccentricity = {0.01 * idx}\n")
+    data_dir = Path(root) / "Data"
+    data_dir.mkdir(parents=True)
+    for file_name in hosted_waveform_files:
+        with open(data_dir / file_name, "wb") as f:
+            f.write(b"waveform data")
+
+
+class RecordingHTTPRequestHandler(QuietHTTPRequestHandler):
+    """Serve files and record the method and path of every request"""
+
+    requests = []
+
+    def do_HEAD(self):
+        self.requests.append(("HEAD", self.path))
+        super().do_HEAD()
+
+    def do_GET(self):
+        self.requests.append(("GET", self.path))
+        super().do_GET()
+
+
+class TestRITCrawl(unittest.TestCase):
+    """Test crawling RIT metadata from a local web server"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.web_root = Path(cls.tmp_dir.name) / "web"
+        write_fake_rit_website(cls.web_root)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def crawl(self, url, cache_name, **kwargs):
+        helper = RITCatalogHelper(use_cache=True)
+        helper.metadata_url = url + "/Metadata/"
+        helper.waveform_data_url = url + "/Data/"
+        helper.metadata_dir = Path(self.tmp_dir.name) / cache_name
+        helper.metadata_dir.mkdir(parents=True)
+        metadata = helper.fetch_metadata_for_catalog(
+            num_sims_to_crawl=num_sims_to_crawl, possible_res=possible_res, **kwargs
+        )
+        return helper, metadata
+
+    def test_concurrent_crawl(self):
+        """Concurrent crawl finds the same simulations as a serial search"""
+        with serve_directory(self.web_root) as url:
+            helper, metadata = self.crawl(url, "concurrent", num_workers=4)
+
+        self.assertEqual(list(metadata["simulation_name"]), expected_sim_names)
+        self.assertEqual(
+            list(metadata["relaxed-mass-ratio-1-over-2"]), [1.0, 2.0, 3.0, 4.0]
+        )
+        self.assertEqual(helper.web_index["metadata"][5], hosted_metadata_files[3:5])
+        on_disk = pd.read_csv(helper.metadata_dir / "metadata.csv")
+        self.assertEqual(list(on_disk["simulation_name"]), expected_sim_names)
+        for name in hosted_metadata_files[:4]:
+            self.assertTrue(os.path.exists(helper.metadata_dir / name))
+
+    def test_discovery_avoids_probing(self):
+        """Only indices missing from the directory listing are probed"""
+        RecordingHTTPRequestHandler.requests = []
+        with serve_directory(
+            self.web_root, handler_class=RecordingHTTPRequestHandler
+        ) as url:
+            helper, metadata = self.crawl(url, "discovery")
+
+        self.assertEqual(list(metadata["simulation_name"]), expected_sim_names)
+        probed = [
+            path
+            for method, path in RecordingHTTPRequestHandler.requests
+            if method == "GET" and path.endswith("_Metadata.txt")
+        ]
+        self.assertGreater(len(probed), 0)
+        for path in probed:
+            if "0003-" in path or "0006-" in path:
+                continue
+            self.assertIn(
+                urllib.parse.unquote(path.split("/")[-1]),
+                hosted_metadata_files,
+                f"Speculative probe for a listed simulation: {path}",
+            )
+
+    def test_discovery_matches_probing(self):
+        """Discovery from the listing and probing give the same table"""
+        with serve_directory(self.web_root) as url:
+            helper_listing, _ = self.crawl(url, "listing", discover=True)
+            helper_probing, _ = self.crawl(url, "probing", discover=False)
+        self.assertIsNone(helper_probing.web_index)
+        listing = pd.read_csv(helper_listing.metadata_dir / "metadata.csv")
+        probing = pd.read_csv(helper_probing.metadata_dir / "metadata.csv")
+        pd.testing.assert_frame_equal(
+            listing.drop(columns=["metadata_location"]),
+            probing.drop(columns=["metadata_location"]),
+        )
+
+    def test_empty_metadata_file_is_a_miss(self):
+        """An empty metadata file is skipped for the next candidate"""
+        web_root = Path(self.tmp_dir.name) / "web_with_empty_file"
+        write_fake_rit_website(web_root)
+        # Empty the file the crawler would otherwise pick for index 5
+        open(web_root / "Metadata" / hosted_metadata_files[3], "w").close()
+
+        with serve_directory(web_root) as url:
+            for discover in [True, False]:
+                _, metadata = self.crawl(
+                    url, f"empty_file_discover_{discover}", discover=discover
+                )
+                self.assertEqual(
+                    list(metadata["simulation_name"]),
+                    expected_sim_names[:3] + ["RIT:BBH:0005-n120-id0"],
+                )
+                self.assertEqual(
+                    list(metadata["relaxed-mass-ratio-1-over-2"]),
+                    [1.0, 2.0, 3.0, 5.0],
+                )
+
+    def test_waveform_download_uses_listing(self):
+        """Waveform files missing from the listing are not requested"""
+        RecordingHTTPRequestHandler.requests = []
+        with serve_directory(
+            self.web_root, handler_class=RecordingHTTPRequestHandler
+        ) as url:
+            helper, metadata = self.crawl(url, "waveforms")
+            requested = {}
+            for discover in [True, False]:
+                helper.waveform_data_dir = helper.metadata_dir / f"data_{discover}"
+                helper.waveform_data_dir.mkdir()
+                RecordingHTTPRequestHandler.requests = []
+                sims = helper.download_waveform_data_for_catalog(
+                    num_sims_to_crawl=num_sims_to_crawl, discover=discover
+                )
+                requested[discover] = sorted(
+                    urllib.parse.unquote(path.split("/")[-1])
+                    for method, path in RecordingHTTPRequestHandler.requests
+                    if method == "GET" and path.endswith(".h5")
+                )
+                self.assertEqual(list(sims), expected_sim_names)
+                self.assertEqual(
+                    sorted(os.listdir(helper.waveform_data_dir)),
+                    hosted_waveform_files,
+                )
+
+        self.assertEqual(requested[True], hosted_waveform_files)
+        self.assertEqual(
+            requested[False],
+            sorted(
+                helper.waveform_filename_from_simname(sim_name)
+                for sim_name in expected_sim_names
+            ),
+        )
+
+    def test_resume_from_journal(self):
+        """An interrupted crawl resumes after the committed indices"""
+        cache_dir = Path(self.tmp_dir.name) / "resumed"
+        cache_dir.mkdir(parents=True)
+        journal = RITMetadataJournal(cache_dir / "metadata_journal.jsonl")
+        journal.append(1, {"simulation_name": "RIT:BBH:0001-n100-id3", "q": 1.0})
+        journal.append(2, None)
+        # A partially written line, as left behind by a crash
+        with open(journal.file_path, "a") as f:
+            f.write('{"idx": 3, "metada')
+
+        RecordingHTTPRequestHandler.requests = []
+        with serve_directory(
+            self.web_root, handler_class=RecordingHTTPRequestHandler
+        ) as url:
+            helper = RITCatalogHelper(use_cache=True)
+            helper.metadata_url = url + "/Metadata/"
+            helper.waveform_data_url = url + "/Data/"
+            helper.metadata_dir = cache_dir
+            metadata = helper.fetch_metadata_for_catalog(
+                num_sims_to_crawl=num_sims_to_crawl,
+                possible_res=possible_res,
+                discover=False,
+            )
+
+        self.assertEqual(
+            list(metadata["simulation_name"]),
+            ["RIT:BBH:0001-n100-id3"] + expected_sim_names[2:],
+        )
+        for _, path in RecordingHTTPRequestHandler.requests:
+            self.assertNotIn("0001-", path)
+            self.assertNotIn("0002-", path)
+        self.assertFalse(os.path.exists(journal.file_path))
+        on_disk = pd.read_csv(cache_dir / "metadata.csv")
+        self.assertEqual(len(on_disk), 3)
+
+    def test_crawl_independent_of_concurrency(self):
+        """The metadata table does not depend on the number of workers"""
+        with serve_directory(self.web_root) as url:
+            helper_serial, _ = self.crawl(
+                url,
+                "serial",
+                num_workers=1,
+                max_connections_per_host=1,
+                discover=False,
+            )
+            helper_parallel, _ = self.crawl(
+                url,
+                "parallel",
+                num_workers=8,
+                max_connections_per_host=8,
+                discover=False,
+            )
+        serial = pd.read_csv(helper_serial.metadata_dir / "metadata.csv")
+        parallel = pd.read_csv(helper_parallel.metadata_dir / "metadata.csv")
+        pd.testing.assert_frame_equal(
+            serial.drop(columns=["metadata_location"]),
+            parallel.drop(columns=["metadata_location"]),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,344 @@
+""" Test generating modes and polarizations from waveform modes,
+using synthetic waveform files.
+"""
+
+import os
+import sys
+import tempfile
+
+cwd = os.getcwd()
+
+libpath = f"{cwd}/../"
+
+if libpath not in sys.path:
+    sys.path.append(libpath)
+
+import unittest
+from pathlib import Path
+
+import numpy as np
+from nrcatalogtools import utils, waveform
+
+from helper import write_mode_file
+
+
+class TestGetMode(unittest.TestCase):
+    """Test generating individual modes in physical units"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.path = Path(cls.tmp_dir.name) / "maya.h5"
+        write_mode_file(cls.path, ell_max=4, layout="maya", t_start=-600.0)
+        cls.wfm = waveform.WaveformModes.load_from_h5(str(cls.path))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_resampled_mode(self):
+        """The mode is resampled as when resampling all modes"""
+        total_mass, distance, delta_t = 40.0, 100.0, 1.0 / 8192
+        m_secs = utils.time_to_physical(total_mass)
+        new_time = np.arange(self.wfm.t[0], self.wfm.t[-1], delta_t / m_secs)
+        expected = self.wfm.interpolate(new_time).data[:, self.wfm.index(3, -2)]
+        expected = expected * utils.amp_to_physical(total_mass, distance)
+        for ell, em in [(3, -2), (2, 2)]:
+            h = self.wfm.get_mode(ell, em, total_mass, distance, delta_t=delta_t)
+            self.assertEqual(h.delta_t, delta_t)
+            self.assertEqual(len(h), len(new_time))
+        h = self.wfm.get_mode(3, -2, total_mass, distance, delta_t=delta_t)
+        np.testing.assert_allclose(h.numpy(), expected, rtol=1e-12, atol=0)
+        # The peak of the synthetic 22-mode is at t = 0
+        self.assertAlmostEqual(
+            float(h.start_time), self.wfm.t[0] * m_secs, delta=1e-3 * m_secs
+        )
+
+    def test_peak(self):
+        """The peak of the synthetic 22-mode is at t = 0"""
+        wfm = waveform.WaveformModes.load_from_h5(str(self.path))
+        amp_22 = np.abs(wfm.data[:, wfm.index(2, 2)])
+        self.assertEqual(wfm.peak_index, np.argmax(amp_22))
+        self.assertAlmostEqual(wfm.peak_time, 0, places=3)
+        phase_22 = np.unwrap(np.angle(wfm.data[:, wfm.index(2, 2)]))
+        self.assertEqual(wfm.get_nr_coa_phase(), phase_22[np.argmax(amp_22)] / 2)
+
+
+class TestGetTDWaveforms(unittest.TestCase):
+    """Test generating polarizations for several total masses at once"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.path = Path(cls.tmp_dir.name) / "maya.h5"
+        write_mode_file(cls.path, ell_max=3, layout="maya", t_start=-600.0)
+        cls.wfm = waveform.WaveformModes.load_from_h5(str(cls.path))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_polarizations(self):
+        """Polarizations are resampled in amplitude and phase for every mass"""
+        from scipy.interpolate import InterpolatedUnivariateSpline
+
+        inclination, coa_phase, distance, delta_t = 0.4, 0.3, 100.0, 1.0 / 4096
+        total_masses = [20.0, 60.0]
+        hs = self.wfm.get_td_waveforms(
+            total_masses, distance, inclination, coa_phase, delta_t=delta_t
+        )
+        self.assertEqual(len(hs), len(total_masses))
+        angles = self.wfm.get_angles(inclination, coa_phase)
+        h_nr = self.wfm.evaluate([angles["theta"], angles["psi"], angles["alpha"]])
+        amp = InterpolatedUnivariateSpline(h_nr.time, np.abs(h_nr.ndarray))
+        phase = InterpolatedUnivariateSpline(
+            h_nr.time, np.unwrap(np.angle(h_nr.ndarray))
+        )
+        for total_mass, h in zip(total_masses, hs):
+            m_secs = utils.time_to_physical(total_mass)
+            new_time = np.arange(self.wfm.t[0], self.wfm.t[-1], delta_t / m_secs)
+            expected = np.conjugate(amp(new_time) * np.exp(1j * phase(new_time)))
+            expected *= utils.amp_to_physical(total_mass, distance)
+            self.assertEqual(h.delta_t, delta_t)
+            self.assertAlmostEqual(float(h.start_time), new_time[0] * m_secs)
+            np.testing.assert_allclose(h.numpy(), expected, rtol=1e-12)
+            single = self.wfm.get_td_waveform(
+                total_mass, distance, inclination, coa_phase, delta_t=delta_t
+            )
+            np.testing.assert_array_equal(single.numpy(), h.numpy())
+
+    def test_dimensionless_delta_t(self):
+        """With a time step in units of M, polarizations only differ by
+        the scaling of the amplitude with the total mass"""
+        h_20, h_60 = self.wfm.get_td_waveforms(
+            [20.0, 60.0], 100.0, 0.4, 0.3, delta_t=1.0
+        )
+        self.assertEqual(len(h_20), len(h_60))
+        self.assertAlmostEqual(h_60.delta_t / h_20.delta_t, 3.0)
+        np.testing.assert_allclose(h_60.numpy(), 3 * h_20.numpy(), rtol=1e-12)
+
+
+class TestAmpPhaseInterpolation(unittest.TestCase):
+    """Test resampling complex time series in amplitude and phase"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.path = Path(cls.tmp_dir.name) / "maya.h5"
+        write_mode_file(cls.path, ell_max=3, layout="maya", t_start=-300.0)
+        cls.wfm = waveform.WaveformModes.load_from_h5(str(cls.path))
+        cls.new_time = np.arange(cls.wfm.t[0], cls.wfm.t[-1], 0.3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_time_series(self):
+        """A single series is resampled as with one spline per amplitude and
+        phase"""
+        from scipy.interpolate import CubicSpline, InterpolatedUnivariateSpline
+
+        h = self.wfm.get_polarizations(0.4, 0.3)
+        amp, phase = np.abs(h.ndarray), np.unwrap(np.angle(h.ndarray))
+        for k in [3, 4, 5]:
+            expected = InterpolatedUnivariateSpline(h.time, amp, k=k)(
+                self.new_time
+            ) * np.exp(
+                1j * InterpolatedUnivariateSpline(h.time, phase, k=k)(self.new_time)
+            )
+            resampled = waveform.interpolate_in_amp_phase(h, self.new_time, k=k)
+            self.assertIsInstance(resampled, type(h))
+            np.testing.assert_array_equal(resampled.time, self.new_time)
+            np.testing.assert_allclose(resampled.ndarray, expected, rtol=1e-10)
+        resampled = waveform.interpolate_in_amp_phase(
+            h, self.new_time, k=None, kind="CubicSpline"
+        )
+        expected = CubicSpline(h.time, amp)(self.new_time) * np.exp(
+            1j * CubicSpline(h.time, phase)(self.new_time)
+        )
+        np.testing.assert_allclose(resampled.ndarray, expected, rtol=1e-12)
+
+    def test_modes(self):
+        """All modes are resampled at once, as every mode on its own"""
+        for k, kind in [(3, None), (4, None), (None, "cubic")]:
+            resampled = waveform.interpolate_in_amp_phase(
+                self.wfm, self.new_time, k=k, kind=kind
+            )
+            self.assertIsInstance(resampled, waveform.WaveformModes)
+            self.assertEqual(resampled.shape, (len(self.new_time), self.wfm.n_modes))
+            self.assertEqual(resampled.ell_max, self.wfm.ell_max)
+            for ell, em in [(2, 2), (3, -1)]:
+                mode = self.wfm.ndarray[:, self.wfm.index(ell, em)]
+                expected = waveform.AmpPhaseInterpolant(
+                    self.wfm.time, mode, k=k, kind=kind
+                )(self.new_time)
+                np.testing.assert_allclose(
+                    resampled.ndarray[:, resampled.index(ell, em)],
+                    expected,
+                    rtol=1e-12,
+                )
+
+    def test_reuse(self):
+        """The interpolant is evaluated on several grids, as when rebuilt"""
+        interpolant = waveform.AmpPhaseInterpolant(self.wfm.time, self.wfm.ndarray)
+        for new_time in [self.new_time, self.new_time[::7] + 0.1]:
+            np.testing.assert_array_equal(
+                interpolant(new_time),
+                waveform.AmpPhaseInterpolant(self.wfm.time, self.wfm.ndarray)(new_time),
+            )
+
+
+class TestReferencePhase(unittest.TestCase):
+    """Test finding the reference time and orbital phase"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.path = Path(cls.tmp_dir.name) / "maya.h5"
+        write_mode_file(cls.path, ell_max=2, layout="maya", t_start=-600.0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_reference_time_from_omega(self):
+        """Without a reference time, it is found from the reference
+        orbital frequency"""
+        import h5py
+
+        path = Path(self.tmp_dir.name) / "no_reference_time.h5"
+        write_mode_file(path, ell_max=2, layout="maya", t_start=-600.0)
+        with h5py.File(path, "a") as h5_file:
+            del h5_file.attrs["reference_time"]
+        # The phase of the 22-mode is -2 times the orbital phase
+        def omega(time):
+            return -(0.03 + 0.27 / (1 + np.exp(-time / 15.0)))
+
+        t_ref = -300.0
+        metadata = {"Omega": omega(t_ref)}
+        wfm = waveform.WaveformModes.load_from_h5(str(path), metadata=metadata)
+        self.assertAlmostEqual(wfm.t_ref_nr, t_ref, delta=wfm.time_step)
+        np.testing.assert_allclose(
+            wfm._get_orbital_frequency(), omega(wfm.time), atol=1e-5
+        )
+
+    def test_reference_phase(self):
+        """The reference phase is as from a spline through all samples"""
+        from scipy.interpolate import interp1d
+
+        wfm = waveform.WaveformModes.load_from_h5(str(self.path))
+        phase_22 = wfm._get_phase(2, 2)
+        self.assertIs(wfm._get_phase(2, 2), phase_22)
+        self.assertFalse(phase_22.flags.writeable)
+        nr_phi_ref = interp1d(wfm.time, phase_22 / 2, kind="cubic")(wfm.t_ref_nr)
+        for t_ref in [wfm.t_ref_nr, wfm.t_ref_nr + 0.25, wfm.time[0], wfm.time[-1]]:
+            self.assertAlmostEqual(
+                float(waveform._local_spline_value(wfm.time, phase_22, t_ref)),
+                float(interp1d(wfm.time, phase_22, kind="cubic")(t_ref)),
+                places=10,
+            )
+        self.assertAlmostEqual(
+            float(wfm.get_obs_phi_ref_from_obs_coa_phase(0.5)),
+            float(nr_phi_ref + 0.5 - wfm.get_nr_coa_phase()),
+            places=10,
+        )
+        with self.assertRaises(ValueError):
+            waveform._local_spline_value(wfm.time, phase_22, wfm.time[-1] + 1)
+
+
+class TestRotationAngles(unittest.TestCase):
+    """Test computing the rotation angles of many observers at once"""
+
+    def test_bit_identical(self):
+        """The angles are exactly those computed for every observer"""
+        from nrcatalogtools import lvc
+
+        rng = np.random.default_rng(2)
+        for _ in range(5):
+            ln_hat = rng.normal(size=3)
+            ln_hat /= np.linalg.norm(ln_hat)
+            n_hat = rng.normal(size=3)
+            n_hat -= np.dot(n_hat, ln_hat) * ln_hat
+            n_hat /= np.linalg.norm(n_hat)
+            lal_frame = {"ln_hat": ln_hat, "n_hat": n_hat, "t_ref": -1, "f_ref": None}
+            # Include observers along the orbital angular momentum
+            inclinations = np.append(rng.uniform(0, np.pi, 200), [0, 0])
+            phi_refs = np.append(rng.uniform(-10, 10, 200), [0, 1])
+            angles = lvc.get_rotation_angles_from_lal_frame_array(
+                lal_frame, inclinations, phi_refs
+            )
+            for name in ["theta", "psi", "alpha"]:
+                expected = [
+                    lvc.get_rotation_angles_from_lal_frame(
+                        lal_frame, inclination, phi_ref
+                    )[name]
+                    for inclination, phi_ref in zip(inclinations, phi_refs)
+                ]
+                np.testing.assert_array_equal(angles[name], expected)
+
+
+class TestOrientations(unittest.TestCase):
+    """Test evaluating polarizations for many observer orientations"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.path = Path(cls.tmp_dir.name) / "maya.h5"
+        write_mode_file(cls.path, ell_max=3, layout="maya", t_start=-300.0)
+        cls.wfm = waveform.WaveformModes.load_from_h5(str(cls.path))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_polarizations_batch(self):
+        """Polarizations match those of the individual orientations"""
+        rng = np.random.default_rng(1)
+        inclinations = np.arccos(rng.uniform(-1, 1, 6))
+        coa_phases = rng.uniform(0, 2 * np.pi, 6)
+        angles = self.wfm.get_angles_batch(inclinations, coa_phases)
+        hs = self.wfm.get_polarizations_batch(inclinations, coa_phases)
+        self.assertEqual(hs.shape, (self.wfm.n_times, 6))
+        np.testing.assert_array_equal(hs.time, self.wfm.time)
+        for idx, (inclination, coa_phase) in enumerate(zip(inclinations, coa_phases)):
+            single = self.wfm.get_angles(inclination, coa_phase)
+            for name in ["theta", "psi", "alpha"]:
+                self.assertEqual(angles[name][idx], single[name])
+            h = self.wfm.get_polarizations(inclination, coa_phase)
+            np.testing.assert_allclose(hs.ndarray[:, idx], h.ndarray, rtol=1e-12)
+
+    def test_lal_frame(self):
+        """The LAL source frame is computed once, and the angles are as
+        computed from the file"""
+        import h5py
+        from nrcatalogtools import lvc
+
+        wfm = waveform.WaveformModes.load_from_h5(str(self.path))
+        angles = wfm.get_angles(0.7, 0.2)
+        get_nr_to_lal_frame = waveform.get_nr_to_lal_frame
+        waveform.get_nr_to_lal_frame = None
+        try:
+            for inclination in [0.7, 1.3]:
+                angles = wfm.get_angles(inclination, 0.2)
+                with h5py.File(self.path, "r") as h5_file:
+                    expected = lvc.get_nr_to_lal_rotation_angles(
+                        h5_file,
+                        wfm.sim_metadata,
+                        inclination,
+                        phi_ref=wfm.get_obs_phi_ref_from_obs_coa_phase(0.2),
+                    )
+                self.assertEqual(angles, expected)
+        finally:
+            waveform.get_nr_to_lal_frame = get_nr_to_lal_frame
+
+    def test_broadcasting(self):
+        """A single coalescence phase applies to all inclinations"""
+        inclinations = np.array([[0.1, 0.5], [1.0, 2.0]])
+        angles = self.wfm.get_angles_batch(inclinations, 0.3)
+        self.assertEqual(angles["theta"].shape, (2, 2))
+        hs = self.wfm.get_polarizations_batch(inclinations, 0.3)
+        self.assertEqual(hs.shape, (self.wfm.n_times, 2, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
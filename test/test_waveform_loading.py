@@ -0,0 +1,249 @@
+""" Test loading waveform modes from HDF5 files in the RIT/MAYA format,
+using synthetic waveform files.
+"""
+
+import os
+import sys
+import tempfile
+
+cwd = os.getcwd()
+
+libpath = f"{cwd}/../"
+
+if libpath not in sys.path:
+    sys.path.append(libpath)
+
+import unittest
+from pathlib import Path
+
+import h5py
+import numpy as np
+from nrcatalogtools import cache, utils, waveform
+
+from helper import synthetic_mode_data, write_mode_file
+
+
+class TestTimeStep(unittest.TestCase):
+    """Test estimating the time step of time series"""
+
+    def test_uniform(self):
+        time = np.arange(-1000, 100, 0.1)
+        self.assertAlmostEqual(utils.estimate_time_step(time), 0.1, places=12)
+
+    def test_non_uniform(self):
+        time = np.concatenate([np.arange(0, 10, 0.5), np.arange(10, 20, 0.25)])
+        self.assertEqual(utils.estimate_time_step(time), 0.25)
+
+
+class TestReadModes(unittest.TestCase):
+    """Test reading the amplitude and phase of modes from HDF5 files"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.maya_path = Path(self.tmp_dir.name) / "maya.h5"
+        self.rit_path = Path(self.tmp_dir.name) / "rit.h5"
+        write_mode_file(self.maya_path, ell_max=4, layout="maya")
+        write_mode_file(self.rit_path, ell_max=4, layout="rit")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_read_all_modes(self):
+        """All modes are read, in order of ell and em, as in the file"""
+        for path in [self.maya_path, self.rit_path]:
+            with h5py.File(path, "r") as h5_file:
+                mode_data = waveform.read_modes_from_h5(h5_file)
+                self.assertEqual(
+                    list(mode_data),
+                    [(ell, em) for ell in range(2, 5) for em in range(-ell, ell + 1)],
+                )
+                for (ell, em), arrays in mode_data.items():
+                    expected = [
+                        h5_file[f"{name}_l{ell}_m{em}"][dataset][:]
+                        for name in ["amp", "phase"]
+                        for dataset in ["X", "Y"]
+                    ]
+                    for array, expected_array in zip(arrays, expected):
+                        np.testing.assert_array_equal(array, expected_array)
+
+    def test_select_modes(self):
+        with h5py.File(self.rit_path, "r") as h5_file:
+            self.assertEqual(
+                list(waveform.read_modes_from_h5(h5_file, ell_max=2)),
+                [(2, em) for em in range(-2, 3)],
+            )
+            self.assertEqual(
+                list(waveform.read_modes_from_h5(h5_file, modes=[(3, 1), (2, -2)])),
+                [(2, -2), (3, 1)],
+            )
+
+    def test_mmap(self):
+        """Contiguous datasets are mapped, and others are read"""
+        with h5py.File(self.maya_path, "r") as h5_file:
+            mode_data = waveform.read_modes_from_h5(h5_file, mmap=True)
+            for (ell, em), arrays in mode_data.items():
+                self.assertTrue(all(isinstance(a, np.memmap) for a in arrays))
+                np.testing.assert_array_equal(
+                    arrays[1], h5_file[f"amp_l{ell}_m{em}"]["Y"][:]
+                )
+        compressed_path = Path(self.tmp_dir.name) / "compressed.h5"
+        with h5py.File(compressed_path, "w") as h5_file:
+            h5_file.create_dataset("compressed", data=np.ones(10), compression="gzip")
+            h5_file["contiguous"] = np.ones(10)
+            self.assertIsNone(waveform.map_dataset(h5_file["compressed"]))
+            self.assertIsNotNone(waveform.map_dataset(h5_file["contiguous"]))
+
+    def test_shared_time_axis(self):
+        """Modes sampled at the same times share their time array"""
+        with h5py.File(self.maya_path, "r") as h5_file:
+            mode_data = waveform.read_modes_from_h5(h5_file)
+        time_axes = {id(arrays[i]) for arrays in mode_data.values() for i in [0, 2]}
+        self.assertEqual(len(time_axes), 1)
+        with h5py.File(self.rit_path, "r") as h5_file:
+            mode_data = waveform.read_modes_from_h5(h5_file)
+        time_axes = {id(arrays[i]) for arrays in mode_data.values() for i in [0, 2]}
+        self.assertGreater(len(time_axes), 1)
+
+
+class TestLoadFromH5(unittest.TestCase):
+    """Test building WaveformModes from HDF5 files"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "rit.h5"
+        write_mode_file(self.path, ell_max=3, layout="rit")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_mode_values(self):
+        """Modes are resampled on a common time grid from their amplitude
+        and phase"""
+        wfm = waveform.WaveformModes.load_from_h5(str(self.path))
+        self.assertEqual((wfm.ell_min, wfm.ell_max), (2, 3))
+        self.assertEqual(wfm.shape[1], 12)
+        for ell, em in [(2, 2), (3, -1)]:
+            amp, phase = synthetic_mode_data(wfm.t, ell, em)
+            np.testing.assert_allclose(
+                wfm.data[:, wfm.index(ell, em)],
+                amp * np.exp(1j * phase),
+                atol=1e-5,
+            )
+
+    def test_batched_resampling(self):
+        """Modes sharing a time axis, which are resampled together, are
+        resampled as with one spline per amplitude and phase"""
+        from scipy.interpolate import InterpolatedUnivariateSpline
+
+        wfm = waveform.WaveformModes.load_from_h5(str(self.path))
+        with h5py.File(self.path, "r") as h5_file:
+            for ell, em in [(2, 2), (3, -1), (3, 3)]:
+                amp_group = h5_file[f"amp_l{ell}_m{em}"]
+                phase_group = h5_file[f"phase_l{ell}_m{em}"]
+                amp = InterpolatedUnivariateSpline(amp_group["X"][:], amp_group["Y"][:])
+                phase = InterpolatedUnivariateSpline(
+                    phase_group["X"][:], phase_group["Y"][:]
+                )
+                np.testing.assert_allclose(
+                    wfm.data[:, wfm.index(ell, em)],
+                    amp(wfm.t) * np.exp(1j * phase(wfm.t)),
+                    rtol=1e-10,
+                )
+
+    def test_mmap(self):
+        wfm = waveform.WaveformModes.load_from_h5(str(self.path))
+        mapped = waveform.WaveformModes.load_from_h5(str(self.path), mmap=True)
+        np.testing.assert_array_equal(mapped.data, wfm.data)
+
+    def test_ell_max(self):
+        wfm = waveform.WaveformModes.load_from_h5(str(self.path), ell_max=2)
+        self.assertEqual((wfm.ell_min, wfm.ell_max), (2, 2))
+        self.assertEqual(wfm.shape[1], 5)
+
+    def test_mode_subset(self):
+        """Only the requested modes are loaded, on the same time grid as
+        when loading all modes"""
+        full = waveform.WaveformModes.load_from_h5(str(self.path))
+        wfm = waveform.WaveformModes.load_from_h5(
+            str(self.path), modes=[(2, 2), (2, -2)]
+        )
+        self.assertEqual((wfm.ell_min, wfm.ell_max), (2, 2))
+        np.testing.assert_array_equal(wfm.t, full.t)
+        for em in range(-2, 3):
+            expected = full.data[:, full.index(2, em)] if abs(em) == 2 else 0
+            np.testing.assert_array_equal(wfm.data[:, wfm.index(2, em)], expected)
+        with self.assertRaises(RuntimeError):
+            waveform.WaveformModes.load_from_h5(str(self.path), modes=[(5, 5)])
+
+    def test_lazy(self):
+        """Modes are only loaded when first accessed"""
+        full = waveform.WaveformModes.load_from_h5(str(self.path))
+        wfm = waveform.WaveformModes.load_from_h5(str(self.path), lazy=True)
+        self.assertEqual(wfm.shape, full.shape)
+        self.assertFalse(np.any(wfm.data))
+        np.testing.assert_array_equal(wfm.get_mode_data(3, 1), full.get_mode_data(3, 1))
+        self.assertEqual(len(wfm._pending_modes), 11)
+        self.assertFalse(np.any(wfm.data[:, wfm.index(2, 2)]))
+        wfm.load_modes()
+        np.testing.assert_array_equal(wfm.data, full.data)
+
+
+class TestWaveformCache(unittest.TestCase):
+    """Test the on-disk cache of resampled waveform modes"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "maya.h5"
+        write_mode_file(self.path, ell_max=3, layout="maya")
+        self.cache_info = dict(utils.waveform_cache_info)
+        utils.waveform_cache_info["cache_dir"] = Path(self.tmp_dir.name) / "cache"
+
+    def tearDown(self):
+        utils.waveform_cache_info.update(self.cache_info)
+        self.tmp_dir.cleanup()
+
+    def test_repeat_load(self):
+        """A repeated load maps the cached modes instead of reading the file"""
+        wfm = waveform.WaveformModes.load_from_h5(str(self.path), use_cache=True)
+        read_and_resample = waveform._read_and_resample
+        waveform._read_and_resample = None
+        try:
+            cached = waveform.WaveformModes.load_from_h5(str(self.path), use_cache=True)
+        finally:
+            waveform._read_and_resample = read_and_resample
+        np.testing.assert_array_equal(cached.data, wfm.data)
+        np.testing.assert_array_equal(cached.t, wfm.t)
+        self.assertEqual((cached.ell_min, cached.ell_max), (2, 3))
+        # Different modes are cached separately
+        subset = waveform.WaveformModes.load_from_h5(
+            str(self.path), modes=[(2, 2)], use_cache=True
+        )
+        self.assertEqual(subset.ell_max, 2)
+
+    def test_invalidation(self):
+        """The cache is ignored once the file changes"""
+        waveform.WaveformModes.load_from_h5(str(self.path), use_cache=True)
+        self.assertIsNotNone(
+            cache.read_array_cache(self.path, {"modes": None, "ell_max": None})
+        )
+        write_mode_file(self.path, ell_max=2, layout="maya")
+        wfm = waveform.WaveformModes.load_from_h5(str(self.path), use_cache=True)
+        self.assertEqual(wfm.ell_max, 2)
+
+    def test_eviction(self):
+        """The least recently used entries are evicted beyond the size limit"""
+        cache_dir = utils.waveform_cache_info["cache_dir"]
+        array = np.zeros(1000)
+        for idx in range(3):
+            cache.write_array_cache(self.path, {"idx": idx}, {"data": array})
+            entry = cache._array_cache_entry(self.path, {"idx": idx}, cache_dir)
+            os.utime(entry, ns=(idx, idx))
+        cache.read_array_cache(self.path, {"idx": 0})
+        cache.evict_array_cache(max_bytes=2 * array.nbytes + 1000)
+        self.assertIsNotNone(cache.read_array_cache(self.path, {"idx": 0}))
+        self.assertIsNone(cache.read_array_cache(self.path, {"idx": 1}))
+        self.assertIsNotNone(cache.read_array_cache(self.path, {"idx": 2}))
+
+
+if __name__ == "__main__":
+    unittest.main()